@@ -34,12 +34,30 @@ from pathlib import Path
 from typing import TYPE_CHECKING, TypedDict
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
     from typing import Final, Literal
 
 
 SCRIPT_PATH: Final[Path] = Path().absolute()
 CACHE_DIR: Final[str] = os.path.join(SCRIPT_PATH, "cache")
 
+TRACKER_DOMAINS: Final[tuple[str, ...]] = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "facebook.net",
+    "analytics.tiktok.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "criteo.com",
+    "criteo.net",
+    "scorecardresearch.com",
+    "adnxs.com",
+)
+
 
 class ViewportSize(TypedDict):
     width: int
@@ -53,6 +71,38 @@ class ProxySettings(TypedDict, total=False):
     password: str | None
 
 
+@dataclass(slots=True, frozen=True, kw_only=True)
+class RoutingProfile:
+    """
+    Requests that the browser should abort because only the DOM is needed (the document itself is never blocked by resource type or URL pattern)
+
+    Note that intercepting the requests disables the HTTP cache of the browser
+    """
+
+    block_resource_types: frozenset[str] = field(
+        default=frozenset({"image", "media", "font"}),
+        metadata={
+            "help": 'Resource types to block (i.e., "image", "media", "font", "stylesheet", "script", "xhr", "fetch", "websocket", etc.)'
+        },
+    )
+    block_url_patterns: tuple[str, ...] = field(
+        default=(),
+        metadata={"help": "Regular expressions of the URLs to block"},
+    )
+    block_domains: tuple[str, ...] = field(
+        default=TRACKER_DOMAINS,
+        metadata={
+            "help": "Domains (including their subdomains) to block. By default common analytics and ad trackers are blocked"
+        },
+    )
+    allow: Mapping[str, tuple[str, ...]] = field(
+        default_factory=dict,
+        metadata={
+            "help": "Per-site (host of the page) regular expressions of the URLs that are always allowed, i.e., when a website needs some script or image to render the data"
+        },
+    )
+
+
 @dataclass(slots=True, frozen=True, kw_only=True)
 class BrowserConfig:
     """
@@ -130,3 +180,27 @@ class BrowserConfig:
         default=None,
         metadata={"help": "Proxy server configuration"},
     )
+    context_pool_size: int | None = field(
+        default=None,
+        metadata={
+            "help": "Launch one browser with this many isolated (non-persistent) contexts instead of one persistent context. Note that user_data_dir is not used in this mode"
+        },
+    )
+    context_strategy: Literal["least_loaded", "host_affinity"] = field(
+        default="least_loaded",
+        metadata={
+            "help": 'How the new pages are spread across the contexts of the pool. "host_affinity" keeps all the pages of a host in the same context'
+        },
+    )
+    routing: RoutingProfile | None = field(
+        default=None,
+        metadata={
+            "help": "Block the requests (images, fonts, media, trackers, etc.) that are not needed for the DOM, so the pages load faster"
+        },
+    )
+    storage_state: Path | str | None = field(
+        default=None,
+        metadata={
+            "help": "Storage state file (cookies and local storage) that the contexts of the pool are seeded from"
+        },
+    )
@@ -0,0 +1,174 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import codecs
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from charset_normalizer import detect
+
+from dunia.helpers import host_of
+from dunia.log import debug
+
+if TYPE_CHECKING:
+    from typing import Any, Final
+
+
+BOMS: Final[tuple[tuple[bytes, str], ...]] = (
+    # ? UTF-32 has to be checked before UTF-16 as their BOMs share the prefix
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+META_CHARSET: Final = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.IGNORECASE
+)
+
+
+def normalize_encoding(encoding: str | None) -> str | None:
+    """
+    Return the canonical codec name, or None if Python doesn't know the encoding
+    """
+    if not encoding:
+        return None
+
+    try:
+        return codecs.lookup(encoding.strip().strip("\"'")).name
+    except LookupError:
+        return None
+
+
+def bom_encoding(content: bytes) -> str | None:
+    for bom, encoding in BOMS:
+        if content.startswith(bom):
+            return encoding
+
+    return None
+
+
+def meta_encoding(content: bytes) -> str | None:
+    """
+    Find the encoding declared with <meta charset> or <meta http-equiv="Content-Type">
+    """
+    if match := META_CHARSET.search(content):
+        return normalize_encoding(match.group(1).decode("ascii", errors="ignore"))
+
+    return None
+
+
+def decodes(content: bytes, encoding: str) -> bool:
+    """
+    Whether the sample can be decoded with the encoding (multibyte sequence cut at the end of the sample is ignored)
+    """
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(content, final=False)
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+    return True
+
+
+@dataclass(slots=True, kw_only=True)
+class EncodingDetector:
+    """
+    Staged charset detection: BOM -> <meta> charset in the first few KB -> last confirmed encoding of the host -> charset_normalizer on a bounded sample
+
+    Only the digest of the sample is cached (in a bounded LRU), so the bodies are never kept alive
+    """
+
+    sniff_size: int = field(
+        default=4096,
+        metadata={"help": "Number of bytes searched for the <meta> charset"},
+    )
+    sample_size: int = field(
+        default=64 * 1024,
+        metadata={"help": "Number of bytes given to charset_normalizer"},
+    )
+    cache_size: int = field(
+        default=1024,
+        metadata={"help": "Maximum number of entries in the caches"},
+    )
+    detected: int = field(
+        default=0, metadata={"help": "Number of charset_normalizer detections"}
+    )
+
+    __hosts: OrderedDict[str, str] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    __digests: OrderedDict[bytes, str] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    async def detect(self, content: bytes, url: str | None = None) -> str:
+        if encoding := bom_encoding(content):
+            return encoding
+
+        if encoding := meta_encoding(content[: self.sniff_size]):
+            return encoding
+
+        sample = content[: self.sample_size]
+
+        host = host_of(url) if url else None
+        if host and (encoding := self.__hosts.get(host)) and decodes(sample, encoding):
+            self.__hosts.move_to_end(host)
+            return encoding
+
+        digest = hashlib.blake2b(sample, digest_size=16).digest()
+        if encoding := self.__digests.get(digest):
+            self.__digests.move_to_end(digest)
+            return encoding
+
+        self.detected += 1
+        result = await asyncio.to_thread(detect, sample)
+        encoding = normalize_encoding(result["encoding"]) or "utf-8"  # type: ignore
+        debug(f"Detected encoding from the sample: {encoding}")
+
+        self.__remember(self.__digests, digest, encoding)
+
+        return encoding
+
+    def confirm(self, url: str, encoding: str) -> None:
+        """
+        Remember the encoding that successfully decoded the content of the host
+        """
+        if (host := host_of(url)) and (normalized := normalize_encoding(encoding)):
+            self.__remember(self.__hosts, host, normalized)
+
+    def __remember(self, cache: OrderedDict[Any, str], key: Any, encoding: str) -> None:
+        cache[key] = encoding
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+
+_encoding_detector = EncodingDetector()
+
+
+def get_encoding_detector() -> EncodingDetector:
+    return _encoding_detector
@@ -0,0 +1,254 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.error import BasicError, CircuitOpenError
+from dunia.helpers import host_of
+from dunia.log import warning
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import Literal
+
+    CircuitState = Literal["closed", "open", "half_open"]
+
+
+@dataclass(slots=True, kw_only=True)
+class HostCircuit:
+    state: CircuitState = "closed"
+    failures: int = field(default=0, metadata={"help": "Consecutive failures"})
+    opened_at: float = 0.0
+    probes: int = field(
+        default=0, metadata={"help": "Number of in-flight requests in half-open state"}
+    )
+    rejected: int = field(
+        default=0, metadata={"help": "Number of requests failed fast"}
+    )
+
+
+@dataclass(slots=True, kw_only=True)
+class CircuitBreaker:
+    """
+    Per-host circuit breaker
+
+    After 'failure_threshold' consecutive failures the host's circuit is opened and the requests fail fast with CircuitOpenError. After 'recovery_time' the circuit is half-open and a limited number of probe requests decide whether it is closed again or re-opened
+    """
+
+    failure_threshold: int = 5
+    recovery_time: float = field(
+        default=30.0,
+        metadata={
+            "help": "Time in seconds before the open circuit lets a probe through"
+        },
+    )
+    half_open_probes: int = 1
+
+    __circuits: dict[str, HostCircuit] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def circuit(self, url: str) -> HostCircuit:
+        host = host_of(url)
+        if not (circuit := self.__circuits.get(host)):
+            circuit = self.__circuits[host] = HostCircuit()
+
+        return circuit
+
+    def before(self, url: str) -> None:
+        """
+        Raise CircuitOpenError if the request to the host is not allowed
+        """
+        circuit = self.circuit(url)
+
+        if circuit.state == "open":
+            if time.monotonic() - circuit.opened_at < self.recovery_time:
+                circuit.rejected += 1
+                raise CircuitOpenError(f"Circuit is open for {host_of(url)}", url)
+
+            circuit.state = "half_open"
+            circuit.probes = 0
+
+        if circuit.state == "half_open":
+            if circuit.probes >= self.half_open_probes:
+                circuit.rejected += 1
+                raise CircuitOpenError(f"Circuit is half-open for {host_of(url)}", url)
+
+            circuit.probes += 1
+
+    def check(self, url: str) -> None:
+        """
+        Raise CircuitOpenError if the request to the host would be rejected, without taking a half-open probe (i.e., before waiting for the rate limiter)
+        """
+        circuit = self.circuit(url)
+
+        if (
+            circuit.state == "open"
+            and time.monotonic() - circuit.opened_at < self.recovery_time
+        ) or (circuit.state == "half_open" and circuit.probes >= self.half_open_probes):
+            circuit.rejected += 1
+            raise CircuitOpenError(
+                f"Circuit is {circuit.state} for {host_of(url)}", url
+            )
+
+    @contextmanager
+    def guard(
+        self, url: str, failures: tuple[type[BaseException], ...]
+    ) -> Iterator[None]:
+        """
+        Check the circuit before the request and record its outcome: the exceptions in 'failures' count as failures of the host, other exceptions only release the probe
+        """
+        self.before(url)
+
+        try:
+            yield
+        except failures:
+            self.failure(url)
+            raise
+        except BaseException:
+            self.release(url)
+            raise
+        else:
+            self.success(url)
+
+    def release(self, url: str) -> None:
+        circuit = self.circuit(url)
+        if circuit.state == "half_open" and circuit.probes:
+            circuit.probes -= 1
+
+    def success(self, url: str) -> None:
+        circuit = self.circuit(url)
+        circuit.state = "closed"
+        circuit.failures = 0
+        circuit.probes = 0
+
+    def failure(self, url: str) -> None:
+        circuit = self.circuit(url)
+        circuit.failures += 1
+
+        if circuit.state == "half_open" or (
+            circuit.state == "closed" and circuit.failures >= self.failure_threshold
+        ):
+            warning(
+                f"Opening the circuit for {host_of(url)} after {circuit.failures} failures"
+            )
+            circuit.state = "open"
+            circuit.opened_at = time.monotonic()
+            circuit.probes = 0
+
+    def is_open(self, url: str) -> bool:
+        return self.circuit(url).state == "open"
+
+    def stats(self) -> dict[str, HostCircuit]:
+        return dict(self.__circuits)
+
+
+@dataclass(slots=True, kw_only=True)
+class RetryBudget:
+    """
+    Global retry budget: retries are allowed while they stay under 'ratio' of the first attempts (plus 'min_retries') within the sliding window
+    """
+
+    ratio: float = field(
+        default=0.2, metadata={"help": "Allowed retries per first attempt"}
+    )
+    min_retries: int = field(
+        default=10,
+        metadata={"help": "Retries that are always allowed within the window"},
+    )
+    window: float = field(default=10.0, metadata={"help": "Sliding window in seconds"})
+    exhausted: int = field(
+        default=0, metadata={"help": "Number of retries denied by the budget"}
+    )
+
+    __attempts: deque[float] = field(default_factory=deque, init=False, repr=False)
+    __retries: deque[float] = field(default_factory=deque, init=False, repr=False)
+
+    def attempt(self) -> None:
+        self.__attempts.append(time.monotonic())
+
+    def retry(self) -> None:
+        self.__retries.append(time.monotonic())
+
+    def can_retry(self) -> bool:
+        self.__expire()
+
+        first_attempts = len(self.__attempts) - len(self.__retries)
+        if len(self.__retries) < self.min_retries + self.ratio * first_attempts:
+            return True
+
+        self.exhausted += 1
+        return False
+
+    def __expire(self) -> None:
+        oldest = time.monotonic() - self.window
+        for timestamps in (self.__attempts, self.__retries):
+            while timestamps and timestamps[0] < oldest:
+                timestamps.popleft()
+
+
+_circuit_breaker = CircuitBreaker()
+_retry_budget = RetryBudget()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    return _circuit_breaker
+
+
+def set_circuit_breaker(circuit_breaker: CircuitBreaker) -> None:
+    global _circuit_breaker
+    _circuit_breaker = circuit_breaker
+
+
+def get_retry_budget() -> RetryBudget:
+    return _retry_budget
+
+
+def set_retry_budget(retry_budget: RetryBudget) -> None:
+    global _retry_budget
+    _retry_budget = retry_budget
+
+
+def giveup(err: Exception) -> bool:
+    """
+    backoff's giveup handler: stop retrying if the host's circuit is open or the retry budget is exhausted
+    """
+    if (
+        isinstance(err, BasicError)
+        and err.url
+        and get_circuit_breaker().is_open(err.url)
+    ):
+        return True
+
+    return not get_retry_budget().can_retry()
+
+
+def on_retry(details: dict[str, int | float]) -> None:
+    """
+    backoff's on_backoff handler that spends the retry budget
+    """
+    get_retry_budget().retry()
@@ -0,0 +1,235 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.error import FetchError, PlaywrightError
+from dunia.helpers import host_of
+from dunia.log import debug
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from typing import Final
+
+
+OVERLOAD_STATUSES: Final[frozenset[int]] = frozenset({429, 503})
+
+# ? Other exceptions (i.e., ContentRejected, CircuitOpenError) release the slot without being recorded, as they don't say anything about the load of the host
+CONGESTION_ERRORS: Final[tuple[type[BaseException], ...]] = (
+    asyncio.TimeoutError,
+    FetchError,
+    PlaywrightError,
+)
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ConcurrencyStats:
+    host: str
+    limit: float = field(metadata={"help": "Current concurrency limit"})
+    in_flight: int
+    waiting: int
+    p95_latency: float = field(
+        metadata={"help": "p95 latency of the window in seconds"}
+    )
+    error_rate: float = field(metadata={"help": "Error rate of the window"})
+    increases: int
+    decreases: int
+
+
+@dataclass(slots=True, kw_only=True)
+class Slot:
+    """
+    Concurrency slot of a request, set the status of the response so that 429/503 responses decrease the limit
+    """
+
+    started: float = field(default_factory=time.monotonic)
+    status: int | None = None
+
+
+@dataclass(slots=True, kw_only=True)
+class HostConcurrency:
+    limit: float
+    in_flight: int = 0
+    increases: int = 0
+    decreases: int = 0
+    last_decrease: float = 0.0
+    latencies: deque[float] = field(default_factory=deque)
+    errors: deque[bool] = field(default_factory=deque)
+    waiters: deque[asyncio.Future[None]] = field(default_factory=deque)
+
+    def p95_latency(self) -> float:
+        if not self.latencies:
+            return 0.0
+
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, math.ceil(0.95 * len(latencies)) - 1)]
+
+    def error_rate(self) -> float:
+        return sum(self.errors) / len(self.errors) if self.errors else 0.0
+
+
+@dataclass(slots=True, kw_only=True)
+class AdaptiveConcurrency:
+    """
+    Per-host AIMD (additive increase, multiplicative decrease) concurrency limiter
+
+    The limit of the host grows by about 1 per 'limit' successful requests while p95 latency and error rate of the recent requests stay under the targets, and is multiplied by 'decrease' on timeouts, network errors or 429/503 responses (at most once per congestion event)
+
+    Usage:
+        async with get_adaptive_concurrency().slot(url) as slot:
+            response = await ...
+            slot.status = response.status
+    """
+
+    initial: float = 4.0
+    min_limit: float = 1.0
+    max_limit: float = 64.0
+    target_p95_latency: float = field(
+        default=5.0,
+        metadata={"help": "Limit is not increased while p95 latency is over it"},
+    )
+    max_error_rate: float = field(
+        default=0.05,
+        metadata={"help": "Limit is not increased while the error rate is over it"},
+    )
+    increase: float = field(
+        default=1.0, metadata={"help": "Additive increase per 'limit' successes"}
+    )
+    decrease: float = field(
+        default=0.5, metadata={"help": "Multiplicative decrease on congestion"}
+    )
+    window: int = field(
+        default=100,
+        metadata={"help": "Number of recent requests used for latency and error rate"},
+    )
+
+    __hosts: dict[str, HostConcurrency] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def host(self, url: str) -> HostConcurrency:
+        host = host_of(url)
+        if not (state := self.__hosts.get(host)):
+            state = self.__hosts[host] = HostConcurrency(limit=self.initial)
+
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[Slot]:
+        state = self.host(url)
+        await self.__acquire(state)
+
+        slot = Slot()
+        try:
+            yield slot
+        except CONGESTION_ERRORS:
+            self.__record(url, state, slot, failed=True)
+            raise
+        else:
+            self.__record(url, state, slot, failed=slot.status in OVERLOAD_STATUSES)
+        finally:
+            state.in_flight -= 1
+            self.__wake(state)
+
+    def limits(self) -> dict[str, ConcurrencyStats]:
+        return {
+            host: ConcurrencyStats(
+                host=host,
+                limit=state.limit,
+                in_flight=state.in_flight,
+                waiting=len(state.waiters),
+                p95_latency=state.p95_latency(),
+                error_rate=state.error_rate(),
+                increases=state.increases,
+                decreases=state.decreases,
+            )
+            for host, state in self.__hosts.items()
+        }
+
+    async def __acquire(self, state: HostConcurrency) -> None:
+        while state.in_flight >= max(1, math.floor(state.limit)):
+            waiter = asyncio.get_running_loop().create_future()
+            state.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in state.waiters:
+                    state.waiters.remove(waiter)
+                # ? Pass the wake-up to the next waiter if this one was already woken
+                elif waiter.done() and not waiter.cancelled():
+                    self.__wake(state)
+                raise
+
+        state.in_flight += 1
+
+    def __wake(self, state: HostConcurrency) -> None:
+        free = max(1, math.floor(state.limit)) - state.in_flight
+        while free > 0 and state.waiters:
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def __record(
+        self, url: str, state: HostConcurrency, slot: Slot, *, failed: bool
+    ) -> None:
+        state.latencies.append(time.monotonic() - slot.started)
+        state.errors.append(failed)
+        while len(state.latencies) > self.window:
+            state.latencies.popleft()
+            state.errors.popleft()
+
+        if failed:
+            # ? Requests that were started before the last decrease belong to the same congestion event
+            if slot.started >= state.last_decrease:
+                state.limit = max(self.min_limit, state.limit * self.decrease)
+                state.last_decrease = time.monotonic()
+                state.decreases += 1
+                debug(
+                    f"Decreased concurrency of {host_of(url)} to {state.limit:.2f} (status: {slot.status})"
+                )
+        elif (
+            state.p95_latency() <= self.target_p95_latency
+            and state.error_rate() <= self.max_error_rate
+            and state.limit < self.max_limit
+        ):
+            state.limit = min(self.max_limit, state.limit + self.increase / state.limit)
+            state.increases += 1
+
+
+_adaptive_concurrency = AdaptiveConcurrency()
+
+
+def get_adaptive_concurrency() -> AdaptiveConcurrency:
+    return _adaptive_concurrency
+
+
+def set_adaptive_concurrency(adaptive_concurrency: AdaptiveConcurrency) -> None:
+    global _adaptive_concurrency
+    _adaptive_concurrency = adaptive_concurrency
@@ -0,0 +1,312 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from dunia.error import HTMLParsingError
+from dunia.extraction import load_content, parse_document
+from dunia.log import debug
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Iterable,
+        Sequence,
+    )
+    from typing import Any, Final, Literal
+
+    from dunia.document import Document
+    from dunia.fetcher import Fetcher, FetchLimits
+    from dunia.frontier import Frontier
+    from dunia.html import HTML
+    from dunia.playwright._types import PlaywrightBrowser
+    from dunia.playwright.readiness import Readiness
+
+
+ResultType = TypeVar("ResultType")
+
+# ? Marks the end of the stream for the workers of the next stage
+DONE: Final = object()
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class CrawlResult(Generic[ResultType]):
+    url: str
+    value: ResultType | None = None
+    error: BaseException | None = field(
+        default=None,
+        metadata={"help": "Exception raised in any of the stages for this URL"},
+    )
+
+
+@dataclass(slots=True, kw_only=True)
+class CrawlItem:
+    url: str
+    value: Any = None
+    error: BaseException | None = None
+
+
+@dataclass(slots=True, kw_only=True)
+class StageStats:
+    name: str
+    concurrency: int
+    processed: int = field(default=0, metadata={"help": "Number of finished items"})
+    failed: int = field(default=0, metadata={"help": "Number of failed items"})
+    in_flight: int = field(default=0, metadata={"help": "Number of running items"})
+    busy: float = field(
+        default=0.0, metadata={"help": "Total time in seconds spent on the items"}
+    )
+    queued: int = field(
+        default=0, metadata={"help": "Number of items waiting for the stage"}
+    )
+    throughput: float = field(
+        default=0.0, metadata={"help": "Finished items per second since the start"}
+    )
+
+
+@dataclass(slots=True, kw_only=True)
+class Crawler(Generic[ResultType]):
+    """
+    Concurrent crawl pipeline that runs load_content() -> parse_document() -> extraction as separate stages, each with its own concurrency limit and bounded queue, and streams the results as they complete
+
+    The cheap stages (parsing, extraction) don't wait for the slow ones (fetching/visiting), and the bounded queues keep the memory bounded regardless of the number of URLs
+
+    Usage:
+        crawler = Crawler(browser=browser, html=html_for_url, extract=extract, on_failure="fetch")
+        async for result in crawler.run(urls):
+            ...
+    """
+
+    browser: PlaywrightBrowser
+    html: Callable[[str], HTML] = field(
+        metadata={"help": "Factory of the HTML (cache file) for the URL"}
+    )
+    extract: Callable[[str, Document], Awaitable[ResultType]] = field(
+        metadata={"help": "Extraction callback for the parsed document of the URL"}
+    )
+    on_failure: Literal["fetch", "visit", "fetch_first", "visit_first"] | None = None
+    wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "load"
+    ready: Readiness | Sequence[Readiness] | None = field(
+        default=None,
+        metadata={
+            "help": 'Readiness predicates for visiting (navigation only waits for "commit")'
+        },
+    )
+    engine: Literal["lxml", "modest", "lexbor"] = "lxml"
+    async_timeout: int = 600
+    rate_limit: int = 10
+    fetcher: Fetcher | None = field(
+        default=None,
+        metadata={
+            "help": "Backend for fetching the content (i.e., HTTPClient), browser's request API is used by default"
+        },
+    )
+    limits: FetchLimits | None = field(
+        default=None,
+        metadata={"help": "Reject non-HTML or oversized responses when fetching"},
+    )
+    revalidate: bool = field(
+        default=False,
+        metadata={
+            "help": 'Revalidate the existing HTML with a conditional request (ETag / Last-Modified) in "fetch" modes'
+        },
+    )
+    frontier: Frontier | None = field(
+        default=None,
+        metadata={
+            "help": "Mark the loaded URLs as done or failed in the frontier, i.e., when the URLs are fed with frontier.urls()"
+        },
+    )
+    save: bool = field(
+        default=True,
+        metadata={"help": "Save the fetched/visited content to the HTML (cache file)"},
+    )
+    fetch_concurrency: int = 8
+    parse_concurrency: int = field(default_factory=lambda: os.cpu_count() or 1)
+    extract_concurrency: int = 8
+    queue_size: int = field(
+        default=64, metadata={"help": "Maximum number of items between the stages"}
+    )
+
+    __stages: dict[str, StageStats] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    __queues: dict[str, asyncio.Queue[Any]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    __started: float = field(default=0.0, init=False, repr=False)
+
+    def stats(self) -> list[StageStats]:
+        elapsed = time.monotonic() - self.__started
+        for name, stage in self.__stages.items():
+            stage.queued = queue.qsize() if (queue := self.__queues.get(name)) else 0
+            stage.throughput = stage.processed / elapsed if elapsed > 0 else 0.0
+
+        return list(self.__stages.values())
+
+    async def run(
+        self, urls: Iterable[str] | AsyncIterable[str]
+    ) -> AsyncIterator[CrawlResult[ResultType]]:
+        self.__started = time.monotonic()
+        self.__stages = {
+            "fetch": StageStats(name="fetch", concurrency=self.fetch_concurrency),
+            "parse": StageStats(name="parse", concurrency=self.parse_concurrency),
+            "extract": StageStats(name="extract", concurrency=self.extract_concurrency),
+        }
+        self.__queues = {
+            name: asyncio.Queue(maxsize=self.queue_size) for name in self.__stages
+        }
+        results: asyncio.Queue[Any] = asyncio.Queue(maxsize=self.queue_size)
+
+        tasks = [
+            asyncio.create_task(self.__feed(urls)),
+            asyncio.create_task(
+                self.__stage(
+                    "fetch",
+                    self.__fetch,
+                    self.__queues["parse"],
+                    self.parse_concurrency,
+                )
+            ),
+            asyncio.create_task(
+                self.__stage(
+                    "parse",
+                    self.__parse,
+                    self.__queues["extract"],
+                    self.extract_concurrency,
+                )
+            ),
+            asyncio.create_task(self.__stage("extract", self.__extract, results, 1)),
+        ]
+
+        try:
+            while (item := await results.get()) is not DONE:
+                yield CrawlResult(url=item.url, value=item.value, error=item.error)
+
+            # ? Propagate the errors of the feeder (i.e., the iterable of URLs has failed)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __feed(self, urls: Iterable[str] | AsyncIterable[str]) -> None:
+        queue = self.__queues["fetch"]
+
+        error: Exception | None = None
+        try:
+            if isinstance(urls, AsyncIterable):
+                async for url in urls:
+                    await queue.put(CrawlItem(url=url))
+            else:
+                for url in urls:
+                    await queue.put(CrawlItem(url=url))
+        except Exception as err:
+            error = err
+
+        # ? Let the pipeline finish the URLs that are already queued even if the iterable has failed
+        for _ in range(self.fetch_concurrency):
+            await queue.put(DONE)
+
+        if error:
+            raise error
+
+    async def __stage(
+        self,
+        name: str,
+        work: Callable[[CrawlItem], Awaitable[Any]],
+        output: asyncio.Queue[Any],
+        next_concurrency: int,
+    ) -> None:
+        stage = self.__stages[name]
+        source = self.__queues[name]
+
+        async def worker() -> None:
+            while (item := await source.get()) is not DONE:
+                if item.error is None:
+                    stage.in_flight += 1
+                    start = time.monotonic()
+
+                    try:
+                        item.value = await work(item)
+                    except Exception as err:
+                        debug(
+                            f"{name.capitalize()} stage has failed -> {err} ({item.url})"
+                        )
+                        item.error = err
+                        stage.failed += 1
+                    else:
+                        stage.processed += 1
+                    finally:
+                        stage.in_flight -= 1
+                        stage.busy += time.monotonic() - start
+
+                await output.put(item)
+
+        await asyncio.gather(*(worker() for _ in range(stage.concurrency)))
+
+        for _ in range(next_concurrency):
+            await output.put(DONE)
+
+    async def __fetch(self, item: CrawlItem) -> str:
+        html = self.html(item.url)
+        exists = await html.exists()
+
+        content = await load_content(
+            browser=self.browser,
+            url=item.url,
+            html=html,
+            on_failure=self.on_failure,
+            wait_until=self.wait_until,
+            ready=self.ready,
+            async_timeout=self.async_timeout,
+            rate_limit=self.rate_limit,
+            fetcher=self.fetcher,
+            limits=self.limits,
+            revalidate=self.revalidate,
+            frontier=self.frontier,
+        )
+
+        if self.save and not exists:
+            await html.save(content)
+
+        return content
+
+    async def __parse(self, item: CrawlItem) -> Document:
+        if document := await parse_document(item.value, engine=self.engine):
+            return document
+
+        raise HTMLParsingError(
+            f"Could not parse {self.engine.upper()} document", item.url
+        )
+
+    async def __extract(self, item: CrawlItem) -> ResultType:
+        return await self.extract(item.url, item.value)
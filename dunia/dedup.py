@@ -0,0 +1,269 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import html
+import json
+import os
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.helpers import compile_regex
+from dunia.log import debug
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+    from typing import Final, Literal
+
+
+FINGERPRINT_BITS: Final[int] = 64
+
+INVISIBLE_ELEMENTS_REGEX: Final[str] = (
+    r"(?is)<(script|style|noscript|template)\b.*?</\1\s*>|<!--.*?-->"
+)
+TAG_REGEX: Final[str] = r"(?s)<[^>]*>"
+TAG_NAME_REGEX: Final[str] = r"<(/?[a-zA-Z][a-zA-Z0-9-]*)"
+
+
+def visible_text_tokens(content: str) -> list[str]:
+    content = compile_regex(INVISIBLE_ELEMENTS_REGEX).sub(" ", content)
+    content = compile_regex(TAG_REGEX).sub(" ", content)
+    return html.unescape(content).lower().split()
+
+
+def tag_tokens(content: str) -> list[str]:
+    content = compile_regex(INVISIBLE_ELEMENTS_REGEX).sub(" ", content)
+    return [tag.lower() for tag in compile_regex(TAG_NAME_REGEX).findall(content)]
+
+
+def shingles(tokens: list[str], size: int) -> Iterable[str]:
+    if len(tokens) <= size:
+        return [" ".join(tokens)] if tokens else []
+
+    return (" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1))
+
+
+def simhash(features: Iterable[str]) -> int:
+    """
+    64-bit SimHash of the features weighted by their frequency
+    """
+    weights = [0] * FINGERPRINT_BITS
+
+    for feature, count in Counter(features).items():
+        value = int.from_bytes(
+            hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big"
+        )
+        for bit in range(FINGERPRINT_BITS):
+            if value >> bit & 1:
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def feature_shingles(
+    content: str, features: Literal["text", "tags"], shingle_size: int
+) -> list[str]:
+    tokens = visible_text_tokens(content) if features == "text" else tag_tokens(content)
+    return list(shingles(tokens, shingle_size))
+
+
+def compute_fingerprint(
+    content: str, features: Literal["text", "tags"], shingle_size: int
+) -> int:
+    return simhash(feature_shingles(content, features, shingle_size))
+
+
+async def fingerprint(
+    content: str,
+    *,
+    features: Literal["text", "tags"] = "text",
+    shingle_size: int = 4,
+) -> int:
+    """
+    Compute the SimHash fingerprint of the HTML content without parsing it
+
+    "text" uses the shingles of visible text (good for sort orders, tracking parameters and session IDs that only change the markup), "tags" uses the shingles of the tag sequence (good for detecting the same template)
+    """
+    return await asyncio.to_thread(compute_fingerprint, content, features, shingle_size)
+
+
+@dataclass(slots=True, kw_only=True)
+class SimHashIndex:
+    """
+    Compact in-memory index of the fingerprints for finding near-duplicate pages within the configured Hamming distance
+
+    Fingerprints are split into (max_distance + 1) blocks, so any two fingerprints within the max distance share at least one identical block (pigeonhole principle) and only the fingerprints in the same block buckets have to be compared
+    """
+
+    max_distance: int = field(
+        default=3,
+        metadata={
+            "help": "Maximum number of different bits for fingerprints to be considered near-duplicates"
+        },
+    )
+    features: Literal["text", "tags"] = field(
+        default="text",
+        metadata={"help": "Whether to fingerprint the visible text or tag sequence"},
+    )
+    shingle_size: int = field(
+        default=4, metadata={"help": "Number of tokens in every shingle"}
+    )
+    path: Path | str | None = field(
+        default=None,
+        metadata={"help": "JSON file for persisting the index between crawls"},
+    )
+    duplicates: int = field(default=0, init=False)
+
+    __keys: list[str] = field(default_factory=list[str], init=False, repr=False)
+    __positions: dict[str, int] = field(
+        default_factory=dict[str, int], init=False, repr=False
+    )
+    __fingerprints: array[int] = field(
+        default_factory=lambda: array("Q"), init=False, repr=False
+    )
+    __buckets: list[dict[int, list[int]]] = field(
+        default_factory=list[dict[int, list[int]]], init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.max_distance < FINGERPRINT_BITS:
+            raise ValueError(
+                f"max_distance must be between 0 and {FINGERPRINT_BITS - 1}"
+            )
+
+        self.__buckets = [{} for _ in range(self.max_distance + 1)]
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def __blocks(self, value: int) -> list[int]:
+        count = self.max_distance + 1
+        blocks: list[int] = []
+        for i in range(count):
+            start = i * FINGERPRINT_BITS // count
+            end = (i + 1) * FINGERPRINT_BITS // count
+            blocks.append(value >> start & ((1 << (end - start)) - 1))
+
+        return blocks
+
+    def add(self, key: str, value: int) -> None:
+        """
+        Index the fingerprint under the key, the previous fingerprint of the key (i.e., of an earlier crawl) is replaced
+        """
+        if (position := self.__positions.get(key)) is not None:
+            for bucket, block in zip(
+                self.__buckets, self.__blocks(self.__fingerprints[position])
+            ):
+                bucket[block].remove(position)
+                if not bucket[block]:
+                    del bucket[block]
+
+            self.__fingerprints[position] = value
+        else:
+            position = self.__positions[key] = len(self.__keys)
+            self.__keys.append(key)
+            self.__fingerprints.append(value)
+
+        for bucket, block in zip(self.__buckets, self.__blocks(value)):
+            bucket.setdefault(block, []).append(position)
+
+    def find(self, value: int, exclude: str | None = None) -> str | None:
+        """
+        Return the key of the nearest indexed fingerprint within the max distance (except for the fingerprint of the 'exclude' key)
+        """
+        nearest: tuple[int, int] | None = None
+        excluded = self.__positions.get(exclude) if exclude is not None else None
+
+        for bucket, block in zip(self.__buckets, self.__blocks(value)):
+            for position in bucket.get(block, ()):
+                if position == excluded:
+                    continue
+
+                distance = hamming_distance(value, self.__fingerprints[position])
+                if distance <= self.max_distance and (
+                    nearest is None or distance < nearest[0]
+                ):
+                    nearest = (distance, position)
+
+        return self.__keys[nearest[1]] if nearest else None
+
+    async def check(self, key: str, content: str) -> str | None:
+        """
+        Fingerprint the content (i.e., after fetch_content() or load_content()) and return the key (i.e., URL) of the near-duplicate page if it has been seen before, so that parsing can be skipped or the result of the duplicate can be reused
+
+        If the content is not a near-duplicate, it is added to the index under the key (replacing the fingerprint of the previous crawl of the key). Content without any features (i.e., without visible text) is never a near-duplicate
+        """
+        features = await asyncio.to_thread(
+            feature_shingles, content, self.features, self.shingle_size
+        )
+        if not features:
+            return None
+
+        value = await asyncio.to_thread(simhash, features)
+
+        if duplicate := self.find(value, exclude=key):
+            self.duplicates += 1
+            debug(f"Near-duplicate page: {key} -> {duplicate}")
+            return duplicate
+
+        self.add(key, value)
+        return None
+
+    async def load(self) -> None:
+        if self.path and await asyncio.to_thread(os.path.exists, self.path):
+            entries = await asyncio.to_thread(self.__read)
+            for key, value in entries:
+                self.add(key, value)
+
+            debug(f"Loaded {len(entries)} fingerprints: {self.path}")
+
+    async def save(self) -> None:
+        if not self.path:
+            raise ValueError("path is not configured for saving the index")
+
+        entries = list(zip(self.__keys, self.__fingerprints))
+        await asyncio.to_thread(self.__write, entries)
+
+    def __read(self) -> list[tuple[str, int]]:
+        assert self.path
+
+        with open(self.path, encoding="utf-8") as file:
+            return [(key, value) for key, value in json.load(file)]
+
+    def __write(self, entries: list[tuple[str, int]]) -> None:
+        assert self.path
+
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(entries, file, separators=(",", ":"))
+        os.replace(temporary, self.path)
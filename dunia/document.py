@@ -47,6 +47,19 @@ class QuerySelector(
     async def query_selector_all(self, selector: str) -> list[Element]: ...
 
 
+@runtime_checkable
+class LinkHarvester(Protocol):
+    async def links(
+        self,
+        base_url: str | None = None,
+        *,
+        selector: str = "a[href]",
+        attribute: str = "href",
+    ) -> list[str]:
+        """Extract the links in one native pass, resolved against the base URL (or <base href>) and normalized."""
+        ...
+
+
 @runtime_checkable
 class Document(QuerySelector, Protocol):
     pass
@@ -82,6 +82,38 @@ class HTMLParsingError(BasicError):
     pass
 
 
+class ResultStoreError(BasicError):
+    pass
+
+
+class FleetError(BasicError):
+    pass
+
+
+class FetchError(BasicError):
+    pass
+
+
+class ContentRejected(BasicError):
+    pass
+
+
+class CircuitOpenError(BasicError):
+    pass
+
+
+class FrontierError(BasicError):
+    pass
+
+
+class DeadlineExceeded(BasicError):
+    pass
+
+
+class NotReady(BasicError):
+    pass
+
+
 PlaywrightTimeoutError = TimeoutError
 PlaywrightError = Error
 
@@ -23,35 +23,56 @@
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING, Any, cast
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, cast
 
 import backoff
 import lxml.html as lxml
-from async_lru import alru_cache  # type: ignore
-from charset_normalizer import detect
 from selectolax.lexbor import LexborHTMLParser
 from selectolax.parser import HTMLParser
-from throttler import throttle
 
 from dunia.aio import with_timeout
+from dunia.charset import get_encoding_detector
+from dunia.circuit import get_circuit_breaker, get_retry_budget, giveup, on_retry
+from dunia.concurrency import get_adaptive_concurrency
 from dunia.document import Document
 from dunia.error import (
+    FetchError,
     HTMLParsingError,
+    NotReady,
     PlaywrightError,
     PlaywrightTimeoutError,
     TimeoutException,
     backoff_hdlr,
 )
+from dunia.fetcher import PlaywrightFetcher
+from dunia.frontier import track_frontier
+from dunia.helpers import normalize_url
 from dunia.lexbor import LexborDocument
-from dunia.log import debug
+from dunia.log import debug, warning
 from dunia.lxml import LXMLDocument
 from dunia.modest import ModestDocument
+from dunia.playwright.browser import AsyncPlaywrightBrowser
+from dunia.playwright.readiness import wait_until_ready
+from dunia.ratelimit import get_rate_limiter
+from dunia.revalidation import (
+    Validators,
+    delete_validators,
+    get_revalidation_stats,
+    load_validators,
+    save_validators,
+)
+from dunia.singleflight import single_flight
 
 if TYPE_CHECKING:
-    from typing import Literal
+    from collections.abc import AsyncIterator, Hashable, Mapping, Sequence
+    from typing import Any, Literal
 
+    from dunia.fetcher import Fetcher, FetchLimits
+    from dunia.frontier import Frontier
     from dunia.html import HTML
     from dunia.playwright._types import PlaywrightBrowser, PlaywrightPage
+    from dunia.playwright.readiness import Readiness
 
 
 # ? Sometimes websites are throwing JavaScript exceptions in devtools console, which makes the page stuck on "networkidle", so let's make "load" by default for now
@@ -59,7 +80,8 @@ if TYPE_CHECKING:
     backoff.expo,
     TimeoutException,
     max_tries=5,
-    on_backoff=backoff_hdlr,  # type: ignore
+    giveup=giveup,
+    on_backoff=[backoff_hdlr, on_retry],  # type: ignore
 )
 async def visit_link(
     page: PlaywrightPage,
@@ -67,14 +89,94 @@ async def visit_link(
     *,
     timeout: int | None = None,
     wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "load",
+    ready: Readiness | Sequence[Readiness] | None = None,
 ) -> None:
     """
     Visit the page (url) and retry for 5 times if the navigation has been failed within the configured timeout
+
+    Retries stop early if the host's circuit is opened or the global retry budget is exhausted, and the requests to the host with open circuit fail fast with CircuitOpenError
+
+    Concurrent navigations to the same host are limited by the adaptive (AIMD) concurrency limit of the host
+
+    If readiness predicates (i.e., Selector, Expression, DOMStable) are provided, then the navigation only waits for "commit" and returns as soon as all of the predicates are satisfied, otherwise it raises NotReady exception (without retrying)
     """
+    get_retry_budget().attempt()
+
     try:
-        await page.goto(url, timeout=timeout, wait_until=wait_until)
+        with get_circuit_breaker().guard(
+            url, (PlaywrightTimeoutError, PlaywrightError)
+        ):
+            async with get_adaptive_concurrency().slot(url) as slot:
+                response = await page.goto(
+                    url, timeout=timeout, wait_until="commit" if ready else wait_until
+                )
+                slot.status = response.status if response else None
     except (PlaywrightTimeoutError, PlaywrightError) as err:
-        raise TimeoutException(err) from err
+        raise TimeoutException(err, url) from err
+
+    # ? Predicates are waited for outside of the circuit breaker and the concurrency slot, as a page without the expected content (i.e., an out-of-stock product) doesn't say anything about the host
+    if ready:
+        try:
+            await wait_until_ready(page, ready, timeout=timeout)
+        except (PlaywrightTimeoutError, PlaywrightError) as err:
+            raise NotReady(err, url) from err
+
+
+async def render_content(
+    page: PlaywrightPage,
+    content: str,
+    *,
+    wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "load",
+    ready: Readiness | Sequence[Readiness] | None = None,
+) -> None:
+    """
+    Set the content of the page, and wait for the readiness predicates if they are provided
+    """
+    if ready:
+        await page.set_content(content, wait_until="commit")
+        await wait_until_ready(page, ready)
+    else:
+        await page.set_content(content, wait_until=wait_until)
+
+
+async def acquire(url: str, rate_limit: int) -> None:
+    """
+    Check the circuit of the host before waiting for the rate limiter, so the requests to the host with open circuit fail fast without spending the tokens
+    """
+    get_circuit_breaker().check(url)
+    await get_rate_limiter().acquire(url, rate_limit)
+
+
+async def open_page(
+    browser: PlaywrightBrowser, url: str | None = None
+) -> PlaywrightPage:
+    """
+    Create a new page, the URL is used for picking the browser context with "host_affinity" strategy
+    """
+    if isinstance(browser, AsyncPlaywrightBrowser):
+        return await browser.new_page(url)
+
+    return await browser.new_page()
+
+
+@asynccontextmanager
+async def lease_page(
+    browser: PlaywrightBrowser, url: str | None = None
+) -> AsyncIterator[PlaywrightPage]:
+    """
+    Lease a page from the browser's page pool (if it is configured), otherwise create a new page
+
+    The page is always returned to the pool or closed, even if the visit has failed
+    """
+    if isinstance(browser, AsyncPlaywrightBrowser):
+        async with browser.lease_page(url) as page:
+            yield page
+    else:
+        page = await browser.new_page()
+        try:
+            yield page
+        finally:
+            await page.close()
 
 
 async def load_html(
@@ -86,6 +188,19 @@ async def load_html(
     return await html.load() if await html.exists() else None
 
 
+def _load_content_key(
+    *,
+    url: str,
+    html: HTML,
+    on_failure: str | None = None,
+    revalidate: bool = False,
+    **_: Any,
+) -> Hashable:
+    return normalize_url(url), html.file, on_failure, revalidate
+
+
+@track_frontier
+@single_flight(_load_content_key)
 async def load_content(
     *,
     browser: PlaywrightBrowser,
@@ -93,8 +208,13 @@ async def load_content(
     html: HTML,
     on_failure: Literal["fetch", "visit", "fetch_first", "visit_first"] | None = None,
     wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "load",
+    ready: Readiness | Sequence[Readiness] | None = None,
     async_timeout: int = 600,
     rate_limit: int = 10,
+    fetcher: Fetcher | None = None,
+    limits: FetchLimits | None = None,
+    revalidate: bool = False,
+    frontier: Frontier | None = None,
 ) -> str:
     """
     Load HTML content
@@ -102,11 +222,21 @@ async def load_content(
     Read from the file if it exists on disk, otherwise fetch it with Browser using HTTP's GET request
 
     If the request fails and 'strict' is False, then visit the URL
+
+    If 'revalidate' is True, then the existing HTML is revalidated with a conditional request (ETag / Last-Modified) in "fetch" modes
+
+    If the frontier is provided, then the URL is marked as done or failed in it
     """
 
     if await html.exists():
+        if revalidate and on_failure in ("fetch", "fetch_first"):
+            debug(f"Revalidating existing HTML: {html.file}")
+            return await fetch_content(
+                browser, url, rate_limit, fetcher=fetcher, limits=limits, html=html
+            )
+
         debug(f"Loading content from existing HTML: {html.file}")
-        content = await html.load()
+        return await html.load()
 
     match on_failure:
         case None:
@@ -116,7 +246,9 @@ async def load_content(
                 debug(
                     f"HTML content is not present on disk. Fetching content from URL: {url}"
                 )
-                content = await fetch_content(browser, url, rate_limit)
+                content = await fetch_content(
+                    browser, url, rate_limit, fetcher=fetcher, limits=limits, html=html
+                )
             except UnicodeDecodeError as err:
                 if on_failure == "fetch":
                     raise err from err
@@ -126,14 +258,14 @@ async def load_content(
                     f"Fetching failed due to an error ({err}). Visiting the URL ({url}) ..."
                 )
                 try:
-                    visit_link_with_timeout = with_timeout(async_timeout)(  # type: ignore
-                        throttle(rate_limit=rate_limit, period=1.0)(visit_link)  # type: ignore
-                    )
-
-                    page = await browser.new_page()
-                    await visit_link_with_timeout(page, url, wait_until=wait_until)
-                    content = await page.content()
-                    await page.close()
+                    visit_link_with_timeout = with_timeout(async_timeout)(visit_link)
+
+                    await acquire(url, rate_limit)
+                    async with lease_page(browser, url) as page:
+                        await visit_link_with_timeout(
+                            page, url, wait_until=wait_until, ready=ready
+                        )
+                        content = await page.content()
                 except TimeoutException as err:
                     raise err from err
 
@@ -141,14 +273,14 @@ async def load_content(
             debug(f"HTML content is not present on disk. Visiting the URL ({url}) ...")
 
             try:
-                visit_link_with_timeout = with_timeout(async_timeout)(  # type: ignore
-                    throttle(rate_limit=rate_limit, period=1.0)(visit_link)  # type: ignore
-                )
+                visit_link_with_timeout = with_timeout(async_timeout)(visit_link)
 
-                page = await browser.new_page()
-                await visit_link_with_timeout(page, url, wait_until=wait_until)
-                content = await page.content()
-                await page.close()
+                await acquire(url, rate_limit)
+                async with lease_page(browser, url) as page:
+                    await visit_link_with_timeout(
+                        page, url, wait_until=wait_until, ready=ready
+                    )
+                    content = await page.content()
             except TimeoutException as err:
                 if on_failure == "visit":
                     raise err from err
@@ -158,72 +290,147 @@ async def load_content(
                     debug(
                         f"Visiting failed due to an error ({err}). Fetching the URL ({url}) ..."
                     )
-                    content = await fetch_content(browser, url, rate_limit)
+                    content = await fetch_content(
+                        browser,
+                        url,
+                        rate_limit,
+                        fetcher=fetcher,
+                        limits=limits,
+                        html=html,
+                    )
                 except UnicodeDecodeError as err:
                     raise err from err
 
     return content
 
 
+def _fetch_content_key(
+    browser: PlaywrightBrowser | None,
+    url: str,
+    rate_limit: int,
+    encoding: str | None = None,
+    *,
+    html: HTML | None = None,
+    **_: Any,
+) -> Hashable:
+    return normalize_url(url), encoding, html.file if html else None
+
+
+@single_flight(_fetch_content_key)
 @backoff.on_exception(
     backoff.expo,
     TimeoutException,
     max_tries=5,
-    on_backoff=backoff_hdlr,  # type: ignore
+    giveup=giveup,
+    on_backoff=[backoff_hdlr, on_retry],  # type: ignore
 )
 async def fetch_content(
-    browser: PlaywrightBrowser, url: str, rate_limit: int, encoding: str | None = None
+    browser: PlaywrightBrowser | None,
+    url: str,
+    rate_limit: int,
+    encoding: str | None = None,
+    *,
+    fetcher: Fetcher | None = None,
+    limits: FetchLimits | None = None,
+    html: HTML | None = None,
 ) -> str:
     """
-    Use the Browser to send HTTP's GET request and receive the content response
+    Send HTTP's GET request and receive the content response
+
+    The request is sent with the Browser unless a different fetcher (i.e., HTTPClient) is provided
+
+    If limits are provided, then non-HTML or oversized responses are rejected (ContentRejected exception) without reading or decoding the whole body
+
+    If html is provided, then the validators (ETag / Last-Modified) of the response are stored next to it, and if it already exists, then it is revalidated with a conditional request: cached content is returned on 304 (and on error statuses), otherwise the HTML is replaced with the new content
 
     If encoding is not provided, then it will try to find the encoding from content body
 
     If it fails, then encoding will be detected using `charset_normalizer`
     """
-    get = throttle(rate_limit=rate_limit, period=1.0)(  # type: ignore
-        browser.request.get
-    )
+    await acquire(url, rate_limit)
+
+    stats = get_revalidation_stats()
+    cached = html is not None and await html.exists()
+    validators = await load_validators(html) if html and cached else Validators()
+    if validators:
+        stats.requests += 1
+
+    get_retry_budget().attempt()
 
     try:
-        response: Any = await get(url)
-    except (PlaywrightTimeoutError, PlaywrightError) as err:
-        raise TimeoutException(err) from err
+        with get_circuit_breaker().guard(
+            url, (PlaywrightTimeoutError, PlaywrightError, FetchError)
+        ):
+            async with get_adaptive_concurrency().slot(url) as slot:
+                response = await (fetcher or PlaywrightFetcher(browser)).get(
+                    url, headers=validators.conditional_headers() or None, limits=limits
+                )
+                slot.status = response.status
+    except (PlaywrightTimeoutError, PlaywrightError, FetchError) as err:
+        raise TimeoutException(err, url) from err
+
+    if html:
+        if response.status == 304 and cached:
+            stats.revalidated += 1
+            debug(f"Not modified, loading content from existing HTML: {html.file}")
+            return await html.load()
+
+        if not response.ok:
+            if cached:
+                warning(
+                    f"Revalidation failed with status {response.status}, loading content from existing HTML: {html.file}"
+                )
+                return await html.load()
+        elif new_validators := Validators.from_headers(response.headers):
+            await save_validators(html, new_validators)
+        else:
+            await delete_validators(html)
+
+        if cached and response.ok:
+            stats.modified += 1
+            content = await decode_content(
+                response.body, response.headers, encoding, url
+            )
+            await html.save(content)
+            return content
 
-    body = cast(bytes, await response.body())
+    return await decode_content(response.body, response.headers, encoding, url)
 
+
+async def decode_content(
+    body: bytes,
+    headers: Mapping[str, str],
+    encoding: str | None = None,
+    url: str | None = None,
+) -> str:
+    """
+    Decode the response body with the encoding provided, in Content-Type header or detected from the body
+    """
     if encoding:
         return body.decode(encoding)
 
-    try:
-        content_type = response.headers["content-type"]
-    except KeyError:
-        detected_encoding = await detect_encoding(body)
-        debug(f"Detected encoding: {detected_encoding}")
+    content_type = headers.get("content-type", "")
+    debug(f"Content-Type: {content_type}")
 
-        return body.decode(detected_encoding)
+    if "charset=" in content_type:
+        content_encoding = content_type.split("charset=")[-1].strip()
+        debug(f"Content encoding: {content_encoding}")
     else:
-        debug(f"Content-Type: {content_type}")
-
-        if "charset=" in content_type:
-            content_encoding = content_type.split("charset=")[-1].strip()
-            debug(f"Content encoding: {content_encoding}")
+        content_encoding = await detect_encoding(body, url)
+        debug(f"Detected encoding: {content_encoding}")
 
-            return body.decode(content_encoding)
-        else:
-            detected_encoding = await detect_encoding(body)
-            debug(f"Detected encoding: {detected_encoding}")
+    content = body.decode(content_encoding)
+    if url:
+        get_encoding_detector().confirm(url, content_encoding)
 
-            return body.decode(detected_encoding)
+    return content
 
 
-@alru_cache
-async def detect_encoding(content: bytes) -> str:
+async def detect_encoding(content: bytes, url: str | None = None) -> str:
     """
-    Find the most probable encoding of the content
+    Find the most probable encoding of the content (BOM, <meta> charset, last confirmed encoding of the host and then charset_normalizer on a sample)
     """
-    encoding = await asyncio.to_thread(detect, content)
-    return encoding["encoding"]  # type: ignore
+    return await get_encoding_detector().detect(content, url)
 
 
 async def load_page(
@@ -233,17 +440,26 @@ async def load_page(
     html: HTML,
     on_failure: Literal["fetch", "visit", "fetch_first", "visit_first"] | None = None,
     wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "load",
+    ready: Readiness | Sequence[Readiness] | None = None,
     async_timeout: int = 600,
     rate_limit: int = 10,
+    fetcher: Fetcher | None = None,
+    limits: FetchLimits | None = None,
+    save: bool = False,
 ) -> PlaywrightPage:
     """
     Create a new page in the browser and visit the URL
+
+    The visited page is returned as it is (rendered only once), set_content() is only used for the content loaded from disk or fetched
+
+    If 'save' is True, then the fetched/visited content is saved to the HTML
     """
     if await html.exists():
         debug(f"Loading content from existing HTML: {html.file}")
         content = await html.load()
-        page = await browser.new_page()
-        await page.set_content(content, wait_until=wait_until)
+        return await render_page(
+            browser, url, content, wait_until=wait_until, ready=ready
+        )
 
     match on_failure:
         case None:
@@ -253,7 +469,9 @@ async def load_page(
                 debug(
                     f"HTML content is not present on disk. Fetching content from URL: {url}"
                 )
-                content = await fetch_content(browser, url, rate_limit)
+                content = await fetch_content(
+                    browser, url, rate_limit, fetcher=fetcher, limits=limits
+                )
             except UnicodeDecodeError as err:
                 if on_failure == "fetch":
                     raise err from err
@@ -262,52 +480,115 @@ async def load_page(
                 debug(
                     f"Fetching failed due to an error ({err}). Visiting the URL ({url}) ..."
                 )
-                try:
-                    visit_link_with_timeout = with_timeout(async_timeout)(  # type: ignore
-                        throttle(rate_limit=rate_limit, period=1.0)(visit_link)  # type: ignore
-                    )
-
-                    page = await browser.new_page()
-                    await visit_link_with_timeout(page, url, wait_until=wait_until)
-                    content = await page.content()
-                    await page.set_content(content, wait_until=wait_until)
-                except TimeoutException as err:
-                    raise err from err
+                page = await visit_page(
+                    browser,
+                    url,
+                    wait_until=wait_until,
+                    ready=ready,
+                    async_timeout=async_timeout,
+                    rate_limit=rate_limit,
+                )
+                if save:
+                    await save_page(page, html)
             else:
-                page = await browser.new_page()
-                await page.set_content(content, wait_until=wait_until)
+                if save:
+                    await html.save(content)
+                page = await render_page(
+                    browser, url, content, wait_until=wait_until, ready=ready
+                )
 
         case "visit" | "visit_first":
             debug(f"HTML content is not present on disk. Visiting the URL ({url}) ...")
 
             try:
-                visit_link_with_timeout = with_timeout(async_timeout)(  # type: ignore
-                    throttle(rate_limit=rate_limit, period=1.0)(visit_link)  # type: ignore
+                page = await visit_page(
+                    browser,
+                    url,
+                    wait_until=wait_until,
+                    ready=ready,
+                    async_timeout=async_timeout,
+                    rate_limit=rate_limit,
                 )
-
-                page = await browser.new_page()
-                await visit_link_with_timeout(page, url, wait_until=wait_until)
-                content = await page.content()
-                await page.set_content(content, wait_until=wait_until)
             except TimeoutException as err:
                 if on_failure == "visit":
                     raise err from err
 
                 # ? In the case of "visit_first"
-                try:
-                    debug(
-                        f"Visiting failed due to an error ({err}). Fetching the URL ({url}) ..."
-                    )
-                    content = await fetch_content(browser, url, rate_limit)
-                except UnicodeDecodeError as err:
-                    raise err from err
-                else:
-                    page = await browser.new_page()
-                    await page.set_content(content, wait_until=wait_until)
+                debug(
+                    f"Visiting failed due to an error ({err}). Fetching the URL ({url}) ..."
+                )
+                content = await fetch_content(
+                    browser, url, rate_limit, fetcher=fetcher, limits=limits
+                )
+                if save:
+                    await html.save(content)
+                page = await render_page(
+                    browser, url, content, wait_until=wait_until, ready=ready
+                )
+            else:
+                if save:
+                    await save_page(page, html)
+
+    return page
+
+
+async def visit_page(
+    browser: PlaywrightBrowser,
+    url: str,
+    *,
+    wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "load",
+    ready: Readiness | Sequence[Readiness] | None = None,
+    async_timeout: int = 600,
+    rate_limit: int = 10,
+) -> PlaywrightPage:
+    """
+    Create a new page and visit the URL, the page is closed if the visit fails
+    """
+    visit_link_with_timeout = with_timeout(async_timeout)(visit_link)
+
+    await acquire(url, rate_limit)
+    page = await open_page(browser, url)
+    try:
+        await visit_link_with_timeout(page, url, wait_until=wait_until, ready=ready)
+    except BaseException:
+        await page.close()
+        raise
 
     return page
 
 
+async def render_page(
+    browser: PlaywrightBrowser,
+    url: str,
+    content: str,
+    *,
+    wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "load",
+    ready: Readiness | Sequence[Readiness] | None = None,
+) -> PlaywrightPage:
+    """
+    Create a new page and render the content, the page is closed if rendering fails
+    """
+    page = await open_page(browser, url)
+    try:
+        await render_content(page, content, wait_until=wait_until, ready=ready)
+    except BaseException:
+        await page.close()
+        raise
+
+    return page
+
+
+async def save_page(page: PlaywrightPage, html: HTML) -> None:
+    """
+    Save the content of the visited page to the HTML, the page is closed if saving fails
+    """
+    try:
+        await html.save(await page.content())
+    except BaseException:
+        await page.close()
+        raise
+
+
 async def parse_document(
     content: str,
     *,
@@ -357,19 +638,18 @@ async def parse_document_from_url(
     async_timeout: int = 600,
     engine: Literal["lxml", "modest", "lexbor"] = "lxml",
     wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "load",
+    ready: Readiness | Sequence[Readiness] | None = None,
 ) -> Document:
     """
     Visit the URL and parse the HTML content using the specified parser ("lxml", "modest", "lexbor")
 
     Return document object if parsing is successful, however, unlike parse_document(), it raises an HTMLParsingError exception if parsing is failed
     """
-    page = await browser.new_page()
-    visit = with_timeout(async_timeout)(  # type: ignore
-        throttle(rate_limit=rate_limit, period=1.0)(visit_link)  # type: ignore
-    )
-    await visit(page, url, wait_until=wait_until)
-    content = await page.content()
-    await page.close()
+    await acquire(url, rate_limit)
+    visit = with_timeout(async_timeout)(visit_link)
+    async with lease_page(browser, url) as page:
+        await visit(page, url, wait_until=wait_until, ready=ready)
+        content = await page.content()
 
     if engine == "lxml":
         try:
@@ -0,0 +1,173 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol
+
+from dunia.error import BrowserNotInitialized, ContentRejected
+from dunia.log import warning
+from dunia.playwright.browser import AsyncPlaywrightBrowser
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from dunia.playwright._types import PlaywrightBrowser
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class FetchResponse:
+    url: str = field(metadata={"help": "Final URL after the redirects"})
+    status: int
+    headers: Mapping[str, str] = field(
+        metadata={"help": "Response headers with lowercase names"}
+    )
+    body: bytes = field(repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+@dataclass(slots=True, kw_only=True)
+class FetchLimits:
+    """
+    Limits of the streaming fetch: the headers are checked before the body is read, and the body is read in chunks up to the byte cap
+
+    Responses over the limits are rejected with ContentRejected exception and counted
+    """
+
+    max_bytes: int = field(
+        default=10 * 1024 * 1024,
+        metadata={"help": "Maximum size of the (decoded) body in bytes"},
+    )
+    content_types: tuple[str, ...] = field(
+        default=(
+            "text/html",
+            "application/xhtml+xml",
+            "application/xml",
+            "text/xml",
+            "text/plain",
+        ),
+        metadata={
+            "help": "Accepted media types (responses without Content-Type are accepted)"
+        },
+    )
+    rejected: int = 0
+    rejected_by_reason: dict[str, int] = field(default_factory=dict)
+
+    def check_headers(self, url: str, headers: Mapping[str, str]) -> None:
+        """
+        Reject the response early by its Content-Type and Content-Length headers
+        """
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in self.content_types:
+            raise self.reject(
+                "content_type", f"Content-Type is not accepted: {content_type}", url
+            )
+
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            raise self.reject(
+                "content_length",
+                f"Content-Length ({content_length}) is over the limit ({self.max_bytes})",
+                url,
+            )
+
+    def check_size(self, url: str, size: int) -> None:
+        if size > self.max_bytes:
+            raise self.reject(
+                "size", f"Body is over the limit ({self.max_bytes} bytes)", url
+            )
+
+    def reject(self, reason: str, message: str, url: str) -> ContentRejected:
+        self.rejected += 1
+        self.rejected_by_reason[reason] = self.rejected_by_reason.get(reason, 0) + 1
+        warning(f"Rejected the response: {message} || {url}")
+
+        return ContentRejected(message, url)
+
+
+class Fetcher(Protocol):
+    """
+    Backend that fetch_content() uses for sending HTTP's GET request
+    """
+
+    async def get(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+        limits: FetchLimits | None = None,
+    ) -> FetchResponse: ...
+
+
+@dataclass(slots=True, frozen=True)
+class PlaywrightFetcher:
+    """
+    Send the requests through the browser context's request API (shares the cookies with the browser)
+
+    The API can't stream the body, so only the headers (Content-Type and Content-Length) are checked before the body is transferred to Python. Responses without Content-Length (i.e., chunked) are read completely before their size is checked, use HTTPClient if the byte cap has to be applied while streaming
+    """
+
+    browser: PlaywrightBrowser | None
+
+    async def get(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+        limits: FetchLimits | None = None,
+    ) -> FetchResponse:
+        if not self.browser:
+            raise BrowserNotInitialized(
+                "Browser is required for fetching the content with Playwright", url
+            )
+
+        # ? Lazily started browser is launched on the first request
+        if isinstance(self.browser, AsyncPlaywrightBrowser):
+            await self.browser.start()
+
+        response = await self.browser.request.get(
+            url,
+            headers=dict(headers) if headers else None,
+            timeout=timeout * 1000 if timeout is not None else None,
+        )
+
+        try:
+            if limits:
+                limits.check_headers(url, response.headers)
+
+            body = await response.body()
+            if limits:
+                limits.check_size(url, len(body))
+        finally:
+            await response.dispose()
+
+        return FetchResponse(
+            url=response.url,
+            status=response.status,
+            headers=response.headers,
+            body=body,
+        )
@@ -0,0 +1,387 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+
+from playwright.async_api import async_playwright
+
+from dunia.error import FleetError
+from dunia.log import error, info, warning
+from dunia.playwright.browser import AsyncPlaywrightBrowser
+from dunia.ratelimit import RateLimiter, RateLimitStats, set_rate_limiter
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+    from multiprocessing.context import SpawnContext, SpawnProcess
+    from multiprocessing.queues import Queue
+    from typing import Any
+
+    from dunia.browser import BrowserConfig
+    from dunia.login import LoginInfo
+    from dunia.playwright._types import PlaywrightBrowser
+
+    WorkerTask = Callable[[PlaywrightBrowser, str], Awaitable[Any]]
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class FleetResult:
+    url: str
+    value: Any = None
+    error: str | None = field(
+        default=None, metadata={"help": "Error message if the task has failed"}
+    )
+    worker: int | None = field(
+        default=None, metadata={"help": "Index of the worker that ran the task"}
+    )
+
+
+@dataclass(slots=True, kw_only=True)
+class RemoteRateLimiter:
+    """
+    Rate limiter of the worker process that asks the coordinator for the permission, so the per-host limits are enforced globally across all the workers
+    """
+
+    worker: int
+    outbox: Queue[Any]
+
+    __requests: Iterator[int] = field(
+        default_factory=itertools.count, init=False, repr=False
+    )
+    __waiting: dict[int, asyncio.Future[None]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    async def acquire(self, url: str, rate: float | None = None) -> float:
+        request_id = next(self.__requests)
+        future = asyncio.get_running_loop().create_future()
+        self.__waiting[request_id] = future
+
+        start = asyncio.get_running_loop().time()
+        self.outbox.put(("acquire", self.worker, request_id, url, rate))
+        await future
+
+        return asyncio.get_running_loop().time() - start
+
+    def granted(self, request_id: int) -> None:
+        if (future := self.__waiting.pop(request_id, None)) and not future.done():
+            future.set_result(None)
+
+    def stats(self) -> dict[str, RateLimitStats]:
+        # ? Stats are collected by the coordinator
+        return {}
+
+
+@dataclass(slots=True, kw_only=True)
+class WorkerHandle:
+    index: int
+    process: SpawnProcess
+    inbox: Queue[Any]
+    ready: bool = False
+    stopping: bool = False
+    restarts: int = 0
+    in_flight: dict[int, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True, kw_only=True)
+class CrawlerFleet:
+    """
+    Run the task over the URLs in multiple worker processes, each with its own Playwright browser created from the same BrowserConfig
+
+    The coordinator (parent process) distributes the URLs, enforces the global per-host rate limits over IPC, collects the results and restarts the crashed workers (the URLs they were working on are retried)
+
+    Every worker uses its own persistent profile ("<user_data_dir>-worker-<index>"), as one profile can't be shared by multiple browsers
+
+    The task must be a top-level async function, i.e., "async def task(browser: PlaywrightBrowser, url: str) -> Any", as it is pickled and sent to the worker processes (and so must be the results). Workers are spawned, so the script that runs the fleet must be guarded with 'if __name__ == "__main__":'
+
+    Usage:
+        fleet = CrawlerFleet(browser_config=BrowserConfig(), task=task, workers=4)
+        async for result in fleet.run(urls):
+            ...
+    """
+
+    browser_config: BrowserConfig
+    task: WorkerTask
+    login_info: LoginInfo | None = None
+    workers: int = field(
+        default_factory=lambda: os.cpu_count() or 1,
+        metadata={"help": "Number of worker processes"},
+    )
+    concurrency: int = field(
+        default=4,
+        metadata={"help": "Maximum number of concurrent tasks in every worker"},
+    )
+    rate_limiter: RateLimiter = field(
+        default_factory=RateLimiter,
+        metadata={"help": "Global per-host rate limits enforced by the coordinator"},
+    )
+    max_restarts: int = field(
+        default=3,
+        metadata={"help": "Maximum number of times a crashed worker is restarted"},
+    )
+    max_attempts: int = field(
+        default=2,
+        metadata={
+            "help": "Maximum number of times a URL is tried when its worker has crashed"
+        },
+    )
+    completed: int = field(default=0, init=False)
+    failed: int = field(default=0, init=False)
+
+    __context: SpawnContext = field(
+        default_factory=lambda: multiprocessing.get_context("spawn"),
+        init=False,
+        repr=False,
+    )
+
+    async def run(self, urls: Iterable[str]) -> AsyncIterator[FleetResult]:
+        results: asyncio.Queue[FleetResult | None] = asyncio.Queue()
+
+        # ? Coordinator runs in the background, so that the workers are served (i.e., rate limit grants) while the caller is handling a result
+        coordinator = asyncio.create_task(self.__coordinate(urls, results))
+        coordinator.add_done_callback(lambda _: results.put_nowait(None))
+
+        try:
+            while result := await results.get():
+                yield result
+
+            await coordinator
+        finally:
+            coordinator.cancel()
+            await asyncio.gather(coordinator, return_exceptions=True)
+
+    async def __coordinate(
+        self, urls: Iterable[str], results: asyncio.Queue[FleetResult | None]
+    ) -> None:
+        outbox: Queue[Any] = self.__context.Queue()
+        workers = [self.__start(index, outbox) for index in range(self.workers)]
+
+        job_ids = itertools.count()
+        attempts: dict[int, int] = {}
+        retries: deque[tuple[int, str]] = deque()
+        remaining = iter(urls)
+        exhausted = False
+        grants: set[asyncio.Task[None]] = set()
+
+        try:
+            while True:
+                for worker in workers:
+                    while (
+                        worker.ready
+                        and not worker.stopping
+                        and len(worker.in_flight) < self.concurrency
+                    ):
+                        if retries:
+                            job_id, url = retries.popleft()
+                        elif not exhausted and (url := next(remaining, None)):
+                            job_id = next(job_ids)
+                            attempts[job_id] = 0
+                        else:
+                            exhausted = True
+                            break
+
+                        attempts[job_id] += 1
+                        worker.in_flight[job_id] = url
+                        worker.inbox.put(("job", job_id, url))
+
+                if (
+                    exhausted
+                    and not retries
+                    and not any(worker.in_flight for worker in workers)
+                ):
+                    break
+
+                try:
+                    message = await asyncio.to_thread(outbox.get, True, 0.5)
+                except queue.Empty:
+                    message = None
+
+                match message:
+                    case ("ready", int(index)):
+                        workers[index].ready = True
+                    case ("result", int(index), int(job_id), value):
+                        if url := workers[index].in_flight.pop(job_id, None):
+                            attempts.pop(job_id, None)
+                            self.completed += 1
+                            results.put_nowait(
+                                FleetResult(url=url, value=value, worker=index)
+                            )
+                    case ("error", int(index), int(job_id), str(reason)):
+                        if url := workers[index].in_flight.pop(job_id, None):
+                            attempts.pop(job_id, None)
+                            self.failed += 1
+                            results.put_nowait(
+                                FleetResult(url=url, error=reason, worker=index)
+                            )
+                    case ("acquire", int(index), int(request_id), str(url), rate):
+                        task = asyncio.create_task(
+                            self.__grant(workers[index], request_id, url, rate)
+                        )
+                        grants.add(task)
+                        task.add_done_callback(grants.discard)
+                    case _:
+                        pass
+
+                for index, worker in enumerate(workers):
+                    if worker.process.is_alive() or worker.stopping:
+                        continue
+
+                    warning(
+                        f"Worker {index} has exited with code {worker.process.exitcode}"
+                    )
+                    for job_id, url in worker.in_flight.items():
+                        if attempts[job_id] < self.max_attempts:
+                            retries.append((job_id, url))
+                        else:
+                            self.failed += 1
+                            results.put_nowait(
+                                FleetResult(
+                                    url=url,
+                                    error=f"Worker has crashed {attempts.pop(job_id)} times while running the task",
+                                )
+                            )
+                    worker.in_flight.clear()
+
+                    if worker.restarts < self.max_restarts:
+                        workers[index] = self.__start(index, outbox)
+                        workers[index].restarts = worker.restarts + 1
+                    else:
+                        worker.stopping = True
+
+                if all(worker.stopping for worker in workers):
+                    raise FleetError("All the workers have crashed")
+        finally:
+            for task in grants:
+                task.cancel()
+
+            await asyncio.gather(*(self.__stop(worker) for worker in workers))
+
+    def stats(self) -> dict[str, RateLimitStats]:
+        return self.rate_limiter.stats()
+
+    def __start(self, index: int, outbox: Queue[Any]) -> WorkerHandle:
+        inbox: Queue[Any] = self.__context.Queue()
+        process = self.__context.Process(
+            target=run_worker,
+            args=(
+                index,
+                self.browser_config,
+                self.login_info,
+                self.task,
+                inbox,
+                outbox,
+            ),
+            name=f"dunia-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        info(f"Started worker {index} (Process ID {process.pid})")
+
+        return WorkerHandle(index=index, process=process, inbox=inbox)
+
+    async def __grant(
+        self, worker: WorkerHandle, request_id: int, url: str, rate: float | None
+    ) -> None:
+        await self.rate_limiter.acquire(url, rate)
+        worker.inbox.put(("grant", request_id))
+
+    async def __stop(self, worker: WorkerHandle) -> None:
+        if worker.process.is_alive():
+            worker.stopping = True
+            worker.inbox.put(None)
+            await asyncio.to_thread(worker.process.join, 30)
+
+        if worker.process.is_alive():
+            worker.process.terminate()
+
+
+def run_worker(
+    index: int,
+    browser_config: BrowserConfig,
+    login_info: LoginInfo | None,
+    task: WorkerTask,
+    inbox: Queue[Any],
+    outbox: Queue[Any],
+) -> None:
+    asyncio.run(work(index, browser_config, login_info, task, inbox, outbox))
+
+
+async def work(
+    index: int,
+    browser_config: BrowserConfig,
+    login_info: LoginInfo | None,
+    task: WorkerTask,
+    inbox: Queue[Any],
+    outbox: Queue[Any],
+) -> None:
+    rate_limiter = RemoteRateLimiter(worker=index, outbox=outbox)
+    set_rate_limiter(rate_limiter)
+
+    async def run_job(browser: PlaywrightBrowser, job_id: int, url: str) -> None:
+        try:
+            value = await task(browser, url)
+            # ? Make sure that the result can be sent to the coordinator
+            pickle.dumps(value)
+        except Exception as err:
+            error(f"Task has failed due to an error -> {err} ({url})")
+            outbox.put(("error", index, job_id, repr(err)))
+        else:
+            outbox.put(("result", index, job_id, value))
+
+    # ? Chromium locks the persistent profile, so every worker needs its own user data directory
+    if browser_config.user_data_dir and not browser_config.context_pool_size:
+        browser_config = replace(
+            browser_config,
+            user_data_dir=f"{os.fspath(browser_config.user_data_dir)}-worker-{index}",
+        )
+
+    async with async_playwright() as playwright:
+        browser = AsyncPlaywrightBrowser(
+            browser_config=browser_config,
+            playwright=playwright,
+            login_info=login_info,
+        )
+        await browser.create()
+        outbox.put(("ready", index))
+
+        jobs: set[asyncio.Task[None]] = set()
+        while (message := await asyncio.to_thread(inbox.get)) is not None:
+            match message:
+                case ("job", int(job_id), str(url)):
+                    job = asyncio.create_task(run_job(browser, job_id, url))
+                    jobs.add(job)
+                    job.add_done_callback(jobs.discard)
+                case ("grant", int(request_id)):
+                    rate_limiter.granted(request_id)
+                case _:
+                    pass
+
+        await asyncio.gather(*jobs, return_exceptions=True)
+        await browser.close()
@@ -0,0 +1,357 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import TYPE_CHECKING, cast
+
+from dunia.error import FrontierError
+from dunia.log import debug, info
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Coroutine, Iterable
+    from pathlib import Path
+    from types import TracebackType
+    from typing import Any, Final, Literal, ParamSpec, Self, TypeVar
+
+    ParamsType = ParamSpec("ParamsType")
+    ReturnType = TypeVar("ReturnType")
+
+    URLState = Literal["pending", "leased", "done", "failed"]
+
+
+SCHEMA: Final[tuple[str, ...]] = (
+    "CREATE TABLE IF NOT EXISTS frontier (url TEXT PRIMARY KEY, state TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+    "lease_until REAL, owner TEXT, error TEXT, updated_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state, lease_until)",
+)
+
+
+@dataclass(slots=True, kw_only=True)
+class Frontier:
+    """
+    Persistent, resumable queue of the URLs backed by a local SQLite file in WAL mode
+
+    Every URL is "pending", "leased", "done" or "failed". Leased URLs that are not finished within the lease timeout (i.e., the process has crashed) become pending again, so a restarted process resumes where the last one stopped. Several local processes can share the same file
+
+    Usage:
+        async with Frontier(path="frontier.db") as frontier:
+            await frontier.add(urls)
+            async for url in frontier.urls():
+                content = await load_content(..., url=url, frontier=frontier)
+    """
+
+    path: Path | str = field(metadata={"help": "SQLite database file"})
+    lease_timeout: float = field(
+        default=600.0,
+        metadata={
+            "help": "Time in seconds after which the unfinished leased URL is given to another worker"
+        },
+    )
+    lease_size: int = field(
+        default=16, metadata={"help": "Number of URLs leased in one transaction"}
+    )
+    batch_size: int = field(
+        default=100,
+        metadata={
+            "help": "Maximum number of state transitions buffered before writing"
+        },
+    )
+    flush_interval: float = field(
+        default=1.0,
+        metadata={
+            "help": "Maximum time in seconds a state transition waits in the buffer before it is written"
+        },
+    )
+    owner: str = field(
+        default_factory=lambda: f"{socket.gethostname()}:{os.getpid()}",
+        metadata={"help": "Identifier of this process in the leases"},
+    )
+
+    __connection: sqlite3.Connection | None = field(
+        default=None, init=False, repr=False
+    )
+    __lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    __transitions: list[tuple[URLState, str | None, str]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    __flusher: asyncio.Task[None] | None = field(default=None, init=False, repr=False)
+
+    async def open(self) -> None:
+        self.__connection = await asyncio.to_thread(self.__connect)
+        self.__flusher = asyncio.create_task(self.__flush_forever())
+
+        counts = await self.counts()
+        info(
+            f"Frontier is opened: <blue>{self.path}</> ({', '.join(f'{state}: {count}' for state, count in counts.items())})"
+        )
+
+    async def add(self, urls: Iterable[str]) -> int:
+        """
+        Add the new URLs as pending (URLs that are already in the frontier are ignored)
+        """
+        rows = [(url, time.time()) for url in dict.fromkeys(urls)]
+
+        def add() -> int:
+            with self.__transaction() as connection:
+                before = connection.total_changes
+                connection.executemany(
+                    "INSERT OR IGNORE INTO frontier (url, updated_at) VALUES (?, ?)",
+                    rows,
+                )
+                return connection.total_changes - before
+
+        added = await asyncio.to_thread(add)
+        debug(f"Added {added} new URLs to the frontier")
+
+        return added
+
+    async def lease(self, size: int | None = None) -> list[str]:
+        """
+        Lease the pending URLs (including the ones whose lease has expired)
+        """
+        await self.flush()
+
+        def lease() -> list[str]:
+            now = time.time()
+            with self.__transaction() as connection:
+                connection.execute(
+                    "UPDATE frontier SET state = 'pending', owner = NULL WHERE state = 'leased' AND lease_until < ?",
+                    (now,),
+                )
+                urls = [
+                    url
+                    for (url,) in connection.execute(
+                        "SELECT url FROM frontier WHERE state = 'pending' ORDER BY rowid LIMIT ?",
+                        (size or self.lease_size,),
+                    )
+                ]
+                connection.executemany(
+                    "UPDATE frontier SET state = 'leased', attempts = attempts + 1, lease_until = ?, owner = ?, updated_at = ? WHERE url = ?",
+                    [(now + self.lease_timeout, self.owner, now, url) for url in urls],
+                )
+
+            return urls
+
+        return await asyncio.to_thread(lease)
+
+    async def urls(self, poll_interval: float = 1.0) -> AsyncIterator[str]:
+        """
+        Lease and yield the URLs until there are no pending URLs, and no leased URLs (of any process) that can expire and become pending again
+        """
+        while True:
+            if urls := await self.lease():
+                for url in urls:
+                    yield url
+                continue
+
+            counts = await self.counts()
+            if not counts["pending"] and not counts["leased"]:
+                return
+
+            await asyncio.sleep(poll_interval)
+
+    async def done(self, url: str) -> None:
+        await self.__transition("done", None, url)
+
+    async def fail(self, url: str, err: BaseException | str) -> None:
+        await self.__transition("failed", str(err), url)
+
+    async def release(self, url: str) -> None:
+        """
+        Give the leased URL back as pending without finishing it
+        """
+        await self.__transition("pending", None, url)
+
+    async def retry_failed(self) -> int:
+        """
+        Make the failed URLs pending again
+        """
+
+        def retry() -> int:
+            with self.__transaction() as connection:
+                return connection.execute(
+                    "UPDATE frontier SET state = 'pending', error = NULL WHERE state = 'failed'"
+                ).rowcount
+
+        return await asyncio.to_thread(retry)
+
+    async def counts(self) -> dict[URLState, int]:
+        await self.flush()
+
+        def counts() -> dict[URLState, int]:
+            result: dict[URLState, int] = {
+                "pending": 0,
+                "leased": 0,
+                "done": 0,
+                "failed": 0,
+            }
+            with self.__transaction() as connection:
+                for state, count in connection.execute(
+                    "SELECT state, COUNT(*) FROM frontier GROUP BY state"
+                ):
+                    result[state] = count
+
+            return result
+
+        return await asyncio.to_thread(counts)
+
+    async def flush(self) -> None:
+        """
+        Write the buffered state transitions in one transaction
+        """
+        if not self.__transitions:
+            return
+
+        transitions, self.__transitions = self.__transitions, []
+        now = time.time()
+
+        def flush() -> None:
+            with self.__transaction() as connection:
+                connection.executemany(
+                    "UPDATE frontier SET state = ?, error = ?, lease_until = NULL, owner = NULL, updated_at = ? WHERE url = ?",
+                    [(state, error, now, url) for state, error, url in transitions],
+                )
+
+        try:
+            await asyncio.to_thread(flush)
+        except BaseException:
+            self.__transitions[:0] = transitions
+            raise
+
+    async def close(self) -> None:
+        if self.__flusher:
+            self.__flusher.cancel()
+            await asyncio.gather(self.__flusher, return_exceptions=True)
+            self.__flusher = None
+
+        if self.__connection:
+            await self.flush()
+            await asyncio.to_thread(self.__connection.close)
+            self.__connection = None
+
+    async def __aenter__(self) -> Self:
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def __transition(self, state: URLState, error: str | None, url: str) -> None:
+        self.__transitions.append((state, error, url))
+        if len(self.__transitions) >= self.batch_size:
+            await self.flush()
+
+    async def __flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def __connect(self) -> sqlite3.Connection:
+        # ? Autocommit mode, the transactions are started explicitly with "BEGIN IMMEDIATE" to take the write lock up front
+        connection = sqlite3.connect(
+            self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            connection.execute(statement)
+
+        return connection
+
+    def __transaction(self) -> Transaction:
+        if not self.__connection:
+            raise FrontierError("Please call open() first")
+
+        return Transaction(connection=self.__connection, lock=self.__lock)
+
+
+@dataclass(slots=True, kw_only=True)
+class Transaction:
+    """
+    Write transaction on the shared connection, serialized between the threads of this process and locked between the processes
+    """
+
+    connection: sqlite3.Connection
+    lock: threading.Lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.lock.acquire()
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+
+        return self.connection
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        try:
+            self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+
+
+def track_frontier(
+    fn: Callable[ParamsType, Coroutine[Any, Any, ReturnType]],
+) -> Callable[ParamsType, Coroutine[Any, Any, ReturnType]]:
+    """
+    Decorator that marks the URL (keyword argument) as done or failed in the frontier (keyword argument) after the call
+    """
+
+    @wraps(fn)
+    async def wrapper(*args: ParamsType.args, **kwargs: ParamsType.kwargs):
+        frontier = cast("Frontier | None", kwargs.get("frontier"))
+        if not frontier:
+            return await fn(*args, **kwargs)
+
+        url = cast(str, kwargs["url"])
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as err:
+            await frontier.fail(url, err)
+            raise
+
+        await frontier.done(url)
+
+        return result
+
+    return wrapper
@@ -24,8 +24,40 @@ from __future__ import annotations
 
 import re
 from functools import cache
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
 
 
 @cache
 def compile_regex(r: str):
     return re.compile(r)
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize the URL for comparison: lowercase scheme and host, without default port and fragment
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+
+    # ? IPv6 addresses need the brackets back
+    if ":" in host:
+        host = f"[{host}]"
+
+    netloc = host if port in (None, DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{credentials}@{netloc}"
+
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
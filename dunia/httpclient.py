@@ -0,0 +1,580 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import ssl
+import time
+import zlib
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+from urllib.parse import quote, urljoin, urlsplit
+
+from async_timeout import timeout as async_timeout
+
+from dunia.error import ContentRejected, FetchError
+from dunia.fetcher import FetchResponse
+from dunia.log import debug
+from dunia.playwright.browser import AsyncPlaywrightBrowser
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping
+    from types import TracebackType
+    from typing import Final, Self
+
+    from dunia.fetcher import FetchLimits
+    from dunia.playwright._types import PlaywrightBrowser
+
+    ConnectionKey = tuple[str, str, int]
+
+
+DEFAULT_USER_AGENT: Final[str] = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+REDIRECT_STATUSES: Final[frozenset[int]] = frozenset({301, 302, 303, 307, 308})
+MAX_HEADER_SIZE: Final[int] = 1024 * 1024
+# ? Reserved and already percent-encoded characters are kept as they are
+PATH_SAFE_CHARACTERS: Final[str] = "/%:@!$&'()*+,;=-._~"
+QUERY_SAFE_CHARACTERS: Final[str] = PATH_SAFE_CHARACTERS + "?"
+
+
+@dataclass(slots=True, kw_only=True)
+class Cookie:
+    name: str
+    value: str
+    domain: str
+    path: str = "/"
+    secure: bool = False
+    expires: float | None = None
+    host_only: bool = False
+
+    def matches(self, scheme: str, host: str, path: str, now: float) -> bool:
+        if self.expires is not None and self.expires <= now:
+            return False
+
+        if self.secure and scheme != "https":
+            return False
+
+        if self.host_only:
+            if host != self.domain:
+                return False
+        elif host != self.domain and not host.endswith(f".{self.domain}"):
+            return False
+
+        return path == self.path or path.startswith(self.path.rstrip("/") + "/")
+
+
+@dataclass(slots=True)
+class CookieJar:
+    """
+    Minimal cookie jar for the requests of HTTPClient
+    """
+
+    cookies: dict[tuple[str, str, str], Cookie] = field(default_factory=dict)
+
+    def add(self, cookie: Cookie) -> None:
+        self.cookies[(cookie.domain, cookie.path, cookie.name)] = cookie
+
+    def set_from_header(self, url: str, header: str) -> None:
+        parts = urlsplit(url)
+        name, _, value = header.split(";")[0].partition("=")
+        cookie = Cookie(
+            name=name.strip(),
+            value=value.strip(),
+            domain=(parts.hostname or "").lower(),
+            path=parts.path.rsplit("/", 1)[0] or "/",
+            host_only=True,
+        )
+
+        for attribute in header.split(";")[1:]:
+            key, _, attribute_value = attribute.partition("=")
+            key = key.strip().lower()
+            attribute_value = attribute_value.strip()
+
+            match key:
+                case "domain" if attribute_value:
+                    cookie.domain = attribute_value.lstrip(".").lower()
+                    cookie.host_only = False
+                case "path" if attribute_value.startswith("/"):
+                    cookie.path = attribute_value
+                case "secure":
+                    cookie.secure = True
+                case "max-age" if attribute_value.lstrip("-").isdigit():
+                    cookie.expires = time.time() + int(attribute_value)
+                case "expires" if cookie.expires is None:
+                    try:
+                        cookie.expires = parsedate_to_datetime(
+                            attribute_value
+                        ).timestamp()
+                    except (TypeError, ValueError):
+                        pass
+                case _:
+                    pass
+
+        if cookie.name:
+            self.add(cookie)
+
+    def header_for(self, url: str) -> str | None:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        now = time.time()
+
+        pairs = [
+            f"{cookie.name}={cookie.value}"
+            for cookie in sorted(
+                self.cookies.values(), key=lambda cookie: -len(cookie.path)
+            )
+            if cookie.matches(parts.scheme, host, parts.path or "/", now)
+        ]
+
+        return "; ".join(pairs) if pairs else None
+
+
+@dataclass(slots=True, kw_only=True)
+class Connection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    idle_since: float = field(default_factory=time.monotonic)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+@dataclass(slots=True, kw_only=True)
+class HTTPClient:
+    """
+    Lightweight asyncio HTTP/1.1 client (fetcher) with per-host keep-alive connection pools, gzip/deflate decoding, redirects, timeouts and cookies
+
+    It doesn't need a running browser, so pages that don't need JavaScript can be fetched with a fraction of CPU
+
+    Usage:
+        async with HTTPClient() as client:
+            await client.import_cookies(browser)  # ? Optional
+            content = await fetch_content(browser, url, rate_limit, fetcher=client)
+    """
+
+    max_connections_per_host: int = field(
+        default=8,
+        metadata={"help": "Maximum number of concurrent connections to the same host"},
+    )
+    timeout: float = field(
+        default=30.0,
+        metadata={
+            "help": "Time in seconds to wait for the whole request (including redirects)"
+        },
+    )
+    max_redirects: int = 10
+    idle_timeout: float = field(
+        default=30.0,
+        metadata={
+            "help": "Time in seconds after which an idle keep-alive connection is not reused"
+        },
+    )
+    user_agent: str = DEFAULT_USER_AGENT
+    headers: Mapping[str, str] = field(
+        default_factory=dict,
+        metadata={"help": "Headers that are sent with every request"},
+    )
+    verify_ssl: bool = True
+    cookies: CookieJar = field(default_factory=CookieJar)
+    requests: int = field(default=0, init=False)
+    reused_connections: int = field(default=0, init=False)
+
+    __idle: dict[ConnectionKey, list[Connection]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    __limits: dict[ConnectionKey, asyncio.Semaphore] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    __ssl_context: ssl.SSLContext | None = field(default=None, init=False, repr=False)
+
+    async def get(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+        limits: FetchLimits | None = None,
+    ) -> FetchResponse:
+        try:
+            async with async_timeout(timeout if timeout is not None else self.timeout):
+                for _ in range(self.max_redirects + 1):
+                    response = await self.request(url, headers=headers, limits=limits)
+
+                    if response.status in REDIRECT_STATUSES and (
+                        location := response.headers.get("location")
+                    ):
+                        url = urljoin(response.url, location)
+                        debug(f"Redirected ({response.status}) to: {url}")
+                        continue
+
+                    return response
+        except asyncio.TimeoutError as err:
+            # ? Surface as FetchError, so that it is retried and counted by the circuit breaker like the other network errors
+            raise FetchError(err, url) from err
+
+        raise FetchError(f"Exceeded {self.max_redirects} redirects", url)
+
+    async def request(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        limits: FetchLimits | None = None,
+    ) -> FetchResponse:
+        """
+        Send a single GET request (redirects are not followed)
+
+        If limits are provided, the response is rejected by its headers before reading the body, and the body is read in chunks up to the byte cap
+        """
+        key = connection_key(url)
+        request = self.__build_request(url, headers)
+
+        async with self.__limit(key):
+            for attempt in range(2):
+                connection, reused = await self.__connect(key)
+
+                try:
+                    connection.writer.write(request)
+                    await connection.writer.drain()
+
+                    status, response_headers, set_cookies = await read_head(
+                        connection.reader
+                    )
+                    if limits and status not in REDIRECT_STATUSES:
+                        limits.check_headers(url, response_headers)
+
+                    chunks: list[bytes] = []
+                    size = 0
+                    async for chunk in iter_body(
+                        connection.reader, status, response_headers
+                    ):
+                        size += len(chunk)
+                        if limits:
+                            limits.check_size(url, size)
+                        chunks.append(chunk)
+
+                    body = b"".join(chunks)
+                except (
+                    OSError,
+                    asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError,
+                    ValueError,
+                ) as err:
+                    connection.close()
+
+                    # ? Server may have closed the idle keep-alive connection in the meantime, so retry once with a new connection
+                    if reused and attempt == 0:
+                        continue
+
+                    raise FetchError(err, url) from err
+                except BaseException:
+                    connection.close()
+                    raise
+
+                self.requests += 1
+                self.__release(key, connection, response_headers)
+
+                for header in set_cookies:
+                    self.cookies.set_from_header(url, header)
+
+                try:
+                    body = decode_body(
+                        body,
+                        response_headers.get("content-encoding"),
+                        limits.max_bytes if limits else None,
+                    )
+                except zlib.error as err:
+                    raise FetchError(err, url) from err
+                except ContentRejected:
+                    assert limits
+                    raise limits.reject(
+                        "size",
+                        f"Decoded body is over the limit ({limits.max_bytes} bytes)",
+                        url,
+                    ) from None
+
+                return FetchResponse(
+                    url=url, status=status, headers=response_headers, body=body
+                )
+
+        raise FetchError("Could not send the request", url)
+
+    async def import_cookies(self, browser: PlaywrightBrowser) -> None:
+        """
+        Copy the cookies of the browser context (i.e., after login) to the cookie jar, a lazily started browser is launched first
+        """
+        if isinstance(browser, AsyncPlaywrightBrowser):
+            await browser.start()
+
+        for cookie in await browser.cookies():
+            domain = cookie.get("domain", "")
+            expires = cookie.get("expires", -1)
+            self.cookies.add(
+                Cookie(
+                    name=cookie.get("name", ""),
+                    value=cookie.get("value", ""),
+                    domain=domain.lstrip(".").lower(),
+                    path=cookie.get("path", "/"),
+                    secure=cookie.get("secure", False),
+                    expires=expires if expires >= 0 else None,
+                    host_only=not domain.startswith("."),
+                )
+            )
+
+    async def close(self) -> None:
+        for connections in self.__idle.values():
+            for connection in connections:
+                connection.close()
+
+        self.__idle.clear()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def __limit(self, key: ConnectionKey) -> asyncio.Semaphore:
+        if not (limit := self.__limits.get(key)):
+            limit = self.__limits[key] = asyncio.Semaphore(
+                self.max_connections_per_host
+            )
+
+        return limit
+
+    def __build_request(self, url: str, headers: Mapping[str, str] | None) -> bytes:
+        parts = urlsplit(url)
+        target = quote(parts.path or "/", safe=PATH_SAFE_CHARACTERS) + (
+            f"?{quote(parts.query, safe=QUERY_SAFE_CHARACTERS)}" if parts.query else ""
+        )
+        _, host, port = connection_key(url)
+        if ":" in host:
+            host = f"[{host}]"
+        if parts.port:
+            host = f"{host}:{port}"
+
+        request_headers = {
+            "Host": host,
+            "User-Agent": self.user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+            **self.headers,
+            **(headers or {}),
+        }
+        if cookie := self.cookies.header_for(url):
+            request_headers["Cookie"] = cookie
+
+        lines = [f"GET {target} HTTP/1.1"]
+        lines.extend(f"{name}: {value}" for name, value in request_headers.items())
+
+        try:
+            return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        except UnicodeEncodeError as err:
+            raise FetchError(err, url) from err
+
+    async def __connect(self, key: ConnectionKey) -> tuple[Connection, bool]:
+        now = time.monotonic()
+        idle = self.__idle.get(key, [])
+
+        while idle:
+            connection = idle.pop()
+            if (
+                now - connection.idle_since < self.idle_timeout
+                and not connection.reader.at_eof()
+            ):
+                self.reused_connections += 1
+                return connection, True
+
+            connection.close()
+
+        scheme, host, port = key
+        try:
+            reader, writer = await asyncio.open_connection(
+                host,
+                port,
+                ssl=self.__ssl() if scheme == "https" else None,
+                limit=MAX_HEADER_SIZE,
+            )
+        except OSError as err:
+            raise FetchError(f"Could not connect to {host}:{port} -> {err}") from err
+
+        return Connection(reader=reader, writer=writer), False
+
+    def __release(
+        self, key: ConnectionKey, connection: Connection, headers: Mapping[str, str]
+    ) -> None:
+        if "close" in headers.get("connection", "").lower():
+            connection.close()
+            return
+
+        connection.idle_since = time.monotonic()
+        self.__idle.setdefault(key, []).append(connection)
+
+    def __ssl(self) -> ssl.SSLContext:
+        if not self.__ssl_context:
+            self.__ssl_context = ssl.create_default_context()
+            if not self.verify_ssl:
+                self.__ssl_context.check_hostname = False
+                self.__ssl_context.verify_mode = ssl.CERT_NONE
+
+        return self.__ssl_context
+
+
+def connection_key(url: str) -> ConnectionKey:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise FetchError(f"Unsupported URL: {url}")
+
+    try:
+        host = parts.hostname.encode("idna").decode("ascii").lower()
+        port = parts.port
+    except (UnicodeError, ValueError) as err:
+        raise FetchError(err, url) from err
+
+    return (parts.scheme, host, port or (443 if parts.scheme == "https" else 80))
+
+
+async def read_head(
+    reader: asyncio.StreamReader,
+) -> tuple[int, dict[str, str], list[str]]:
+    """
+    Read the status line and headers. Repeated headers are joined with comma, except Set-Cookie which is returned separately
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+
+    version, status, *_ = status_line.split(" ", 2)
+    if not version.startswith("HTTP/1."):
+        raise ValueError(f"Unsupported protocol: {status_line}")
+
+    headers: dict[str, str] = {}
+    set_cookies: list[str] = []
+    for line in header_lines:
+        if not line:
+            continue
+
+        name, _, value = line.partition(":")
+        name = name.strip().lower()
+        value = value.strip()
+
+        if name == "set-cookie":
+            set_cookies.append(value)
+        elif name in headers:
+            headers[name] = f"{headers[name]}, {value}"
+        else:
+            headers[name] = value
+
+    # ? HTTP/1.0 connections are closed after the response unless asked otherwise
+    if (
+        version == "HTTP/1.0"
+        and "keep-alive" not in headers.get("connection", "").lower()
+    ):
+        headers["connection"] = "close"
+
+    return int(status), headers, set_cookies
+
+
+async def iter_body(
+    reader: asyncio.StreamReader, status: int, headers: dict[str, str]
+) -> AsyncIterator[bytes]:
+    """
+    Read the (still encoded) body in chunks according to the framing of the response
+    """
+    if 100 <= status < 200 or status in (204, 304):
+        return
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";")[0].strip(), 16)
+            if size == 0:
+                # ? Skip the trailers
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return
+
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+
+    elif (content_length := headers.get("content-length")) is not None:
+        remaining = int(content_length)
+        while remaining > 0:
+            chunk = await reader.read(min(remaining, 65536))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", remaining)
+
+            remaining -= len(chunk)
+            yield chunk
+
+    else:
+        # ? Body is delimited by closing the connection, so it can't be reused
+        headers["connection"] = "close"
+        while chunk := await reader.read(65536):
+            yield chunk
+
+
+def decode_body(
+    body: bytes, content_encoding: str | None, max_size: int | None = None
+) -> bytes:
+    """
+    Decode the body according to Content-Encoding, and raise ContentRejected if the decoded body is over the max size
+    """
+    if not body or not content_encoding:
+        return body
+
+    for encoding in reversed(content_encoding.lower().split(",")):
+        match encoding.strip():
+            case "gzip" | "x-gzip":
+                body = decompress(body, 16 + zlib.MAX_WBITS, max_size)
+            case "deflate":
+                # ? Some servers send raw deflate stream without zlib header
+                try:
+                    body = decompress(body, zlib.MAX_WBITS, max_size)
+                except zlib.error:
+                    body = decompress(body, -zlib.MAX_WBITS, max_size)
+            case "identity" | "":
+                pass
+            case unknown:
+                raise FetchError(f"Unsupported content encoding: {unknown}")
+
+    return body
+
+
+def decompress(data: bytes, wbits: int, max_size: int | None) -> bytes:
+    decompressor = zlib.decompressobj(wbits)
+    if max_size is None:
+        return decompressor.decompress(data) + decompressor.flush()
+
+    # ? Never inflate more than the limit (protects from compression bombs)
+    body = decompressor.decompress(data, max_size + 1)
+    if len(body) > max_size:
+        raise ContentRejected(f"Decoded body is over the limit ({max_size} bytes)")
+
+    return body
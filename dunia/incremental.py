@@ -0,0 +1,254 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, cast
+
+import lxml.etree as etree
+
+from dunia.lexbor import LexborElement
+from dunia.log import debug
+from dunia.lxml import LXMLElement
+from dunia.modest import ModestElement
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+    from pathlib import Path
+
+    import lxml.html as lxml
+    from selectolax.lexbor import LexborNode
+    from selectolax.parser import Node as ModestNode
+
+    from dunia.document import Document
+    from dunia.element import Element
+
+
+def normalize_text(text: str | None) -> str:
+    return " ".join(text.split()) if text else ""
+
+
+def lxml_tokens(handle: lxml.HtmlElement) -> Iterator[str]:
+    walk = cast(
+        "Iterator[tuple[str, lxml.HtmlElement]]",
+        etree.iterwalk(handle, events=("start", "end")),
+    )
+    for event, node in walk:
+        # ? Comments and processing instructions don't have a string tag, they are not part of the structure
+        if not isinstance(node.tag, str):
+            if (
+                event == "end"
+                and node is not handle
+                and (tail := normalize_text(cast(str | None, node.tail)))
+            ):
+                yield tail
+            continue
+
+        if event == "start":
+            yield f"<{node.tag}"
+            for name, value in sorted(cast(dict[str, str], node.attrib).items()):
+                yield f"@{name}={value}"
+            if text := normalize_text(cast(str | None, node.text)):
+                yield text
+        else:
+            yield f"</{node.tag}"
+            if node is not handle and (
+                tail := normalize_text(cast(str | None, node.tail))
+            ):
+                yield tail
+
+
+def selectolax_tokens(handle: LexborNode | ModestNode) -> Iterator[str]:
+    stack: list[tuple[LexborNode | ModestNode, bool]] = [(handle, False)]
+
+    while stack:
+        node, closing = stack.pop()
+        tag = node.tag
+
+        if tag is None:
+            continue
+
+        if closing:
+            yield f"</{tag}"
+            continue
+
+        # ? Whitespace-only text nodes are skipped, so that re-indenting doesn't change the hash
+        if tag == "-text":
+            if text := normalize_text(node.text_content):
+                yield text
+            continue
+
+        # ? Comments are "-comment" in lexbor and "_comment" in modest
+        if tag.startswith(("-", "_")):
+            continue
+
+        yield f"<{tag}"
+        for name, value in sorted(node.attributes.items()):
+            yield f"@{name}={value or ''}"
+
+        stack.append((node, True))
+        stack.extend(
+            (child, False)
+            for child in reversed(list(node.iter(include_text=True)))  # type: ignore
+        )
+
+
+def hash_handles(elements: list[Element]) -> str:
+    """
+    Compute one structural hash over all the subtrees (tags, attributes and whitespace normalized text, ignoring comments)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    for element in elements:
+        match element:
+            case LXMLElement(handle):
+                tokens = lxml_tokens(cast("lxml.HtmlElement", handle))
+            case LexborElement(handle) | ModestElement(handle):
+                tokens = selectolax_tokens(handle)
+            case _:
+                raise TypeError(
+                    f"Subtree hashing is not supported for element type: {type(element).__name__}"
+                )
+
+        for token in tokens:
+            digest.update(token.encode())
+            digest.update(b"\x00")
+
+        digest.update(b"\x01")
+
+    return digest.hexdigest()
+
+
+async def subtree_hash(*elements: Element) -> str:
+    """
+    Structural hash of the element subtrees parsed by any of the engines ("lxml", "modest", "lexbor")
+
+    Hashes should only be compared between the documents that are parsed by the same engine, as the parsers can fix the broken HTML differently
+    """
+    return await asyncio.to_thread(hash_handles, list(elements))
+
+
+async def subtree_hashes(
+    document: Document, regions: Mapping[str, str]
+) -> dict[str, str | None]:
+    """
+    Compute the structural hashes of the regions (name -> selector) of the document
+
+    If the selector matches multiple elements, all of them are hashed together. Regions whose selector doesn't match anything have None hash
+    """
+    hashes: dict[str, str | None] = {}
+
+    for name, selector in regions.items():
+        elements = await document.query_selector_all(selector)
+        hashes[name] = await subtree_hash(*elements) if elements else None
+
+    return hashes
+
+
+@dataclass(slots=True, kw_only=True)
+class SubtreeHashStore:
+    """
+    Subtree hashes of the previous crawl (url -> region name -> hash) persisted as JSON file
+    """
+
+    path: Path | str = field(
+        metadata={"help": "JSON file where the hashes are stored between crawls"}
+    )
+
+    __hashes: dict[str, dict[str, str]] = field(
+        default_factory=dict[str, dict[str, str]], init=False, repr=False
+    )
+
+    async def load(self) -> None:
+        if await asyncio.to_thread(os.path.exists, self.path):
+            self.__hashes = await asyncio.to_thread(self.__read)
+            debug(f"Loaded subtree hashes of {len(self.__hashes)} URLs: {self.path}")
+
+    async def save(self) -> None:
+        await asyncio.to_thread(self.__write, dict(self.__hashes))
+
+    def get(self, url: str) -> dict[str, str]:
+        return self.__hashes.get(url, {})
+
+    def commit(self, changes: RegionChanges) -> None:
+        """
+        Store the hashes of the regions after their extraction has succeeded
+        """
+        self.update(changes.url, changes.hashes)
+
+    def update(self, url: str, hashes: Mapping[str, str | None]) -> None:
+        stored = self.__hashes.setdefault(url, {})
+        for name, value in hashes.items():
+            if value is None:
+                stored.pop(name, None)
+            else:
+                stored[name] = value
+
+    def __read(self) -> dict[str, dict[str, str]]:
+        with open(self.path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def __write(self, hashes: dict[str, dict[str, str]]) -> None:
+        # ? Write to a temporary file first so that a crash during writing doesn't corrupt the previous hashes
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(hashes, file, separators=(",", ":"))
+        os.replace(temporary, self.path)
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class RegionChanges:
+    url: str
+    changed: list[str] = field(
+        metadata={"help": "Names of the regions that are new or changed"}
+    )
+    hashes: dict[str, str | None] = field(
+        metadata={"help": "Current hashes of the regions to be committed to the store"}
+    )
+
+
+async def changed_regions(
+    document: Document,
+    url: str,
+    regions: Mapping[str, str],
+    store: SubtreeHashStore,
+) -> RegionChanges:
+    """
+    Compare the regions (name -> selector) of the document against the hashes stored from the previous crawl of the URL
+
+    Return the names of the regions that are new or changed, so that the extraction is only re-run for them, together with the current hashes. The store is not updated here, call store.commit(changes) after the extraction has succeeded (and store.save() to persist them), otherwise the regions would be skipped on the next crawl even if the extraction has failed
+    """
+    previous = store.get(url)
+    current = await subtree_hashes(document, regions)
+
+    changed = [
+        name
+        for name, value in current.items()
+        if value is not None and previous.get(name) != value
+    ]
+    debug(f"Changed regions ({len(changed)}/{len(regions)}): {changed} ({url})")
+
+    return RegionChanges(url=url, changed=changed, hashes=current)
@@ -0,0 +1,237 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from urllib.parse import unquote_plus, urljoin, urlsplit, urlunsplit
+
+from dunia.document import LinkHarvester
+from dunia.helpers import compile_regex, normalize_url
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+    from typing import Final, Self
+
+    from dunia.document import Document
+
+
+TRACKING_PARAMS: Final[tuple[str, ...]] = (
+    r"^utm_",
+    r"^(gclid|dclid|gbraid|wbraid|fbclid|msclkid|yclid|twclid|ttclid)$",
+    r"^(mc_cid|mc_eid|_ga|_gl|_hsenc|_hsmi|igshid|ref_src)$",
+)
+BLOOM_MAGIC: Final[bytes] = b"DUNIABF1"
+BLOOM_HEADER: Final[struct.Struct] = struct.Struct("<QdQQI")
+
+
+def strip_params(url: str, patterns: tuple[str, ...] = TRACKING_PARAMS) -> str:
+    """
+    Remove the query parameters whose names match any of the regular expressions
+    """
+    parts = urlsplit(url)
+    if not parts.query or not patterns:
+        return url
+
+    # ? Filter the raw pairs, so that the encoding of the kept parameters doesn't change
+    pairs = parts.query.split("&")
+    kept = [
+        pair
+        for pair in pairs
+        if not any(
+            compile_regex(pattern).search(unquote_plus(pair.partition("=")[0]))
+            for pattern in patterns
+        )
+    ]
+    if len(kept) == len(pairs):
+        return url
+
+    return urlunsplit(parts._replace(query="&".join(kept)))
+
+
+def normalize_link(
+    href: str,
+    base_url: str | None = None,
+    *,
+    params: tuple[str, ...] = TRACKING_PARAMS,
+) -> str | None:
+    """
+    Resolve the href against the base URL and normalize it (lowercase scheme and host, without default port, fragment and tracking parameters)
+
+    Return None for non-HTTP links (i.e., "javascript:", "mailto:", "tel:")
+    """
+    url = urljoin(base_url, href.strip()) if base_url else href.strip()
+    if urlsplit(url).scheme.lower() not in ("http", "https"):
+        return None
+
+    return strip_params(normalize_url(url), params)
+
+
+def resolve_links(
+    hrefs: Iterable[str],
+    base_url: str | None = None,
+    document_base: str | None = None,
+    *,
+    params: tuple[str, ...] = TRACKING_PARAMS,
+) -> list[str]:
+    """
+    Normalize the hrefs (resolved against the document's <base href> if present) and remove the duplicates, keeping the order
+    """
+    if document_base:
+        base_url = urljoin(base_url, document_base) if base_url else document_base
+
+    links: dict[str, None] = {}
+    for href in hrefs:
+        if link := normalize_link(href, base_url, params=params):
+            links[link] = None
+
+    return list(links)
+
+
+@dataclass(slots=True, kw_only=True)
+class BloomFilter:
+    """
+    Compact set of the seen URLs with fixed memory (about 1.2 bytes per URL at 1% false positive rate)
+
+    False positives are possible (a new URL might be reported as seen), false negatives are not
+    """
+
+    capacity: int = field(
+        default=10_000_000,
+        metadata={"help": "Expected number of items"},
+    )
+    error_rate: float = field(
+        default=0.01,
+        metadata={"help": "False positive rate when the filter holds 'capacity' items"},
+    )
+    count: int = field(default=0, metadata={"help": "Number of added items"})
+
+    __size: int = field(default=0, init=False, repr=False)
+    __hashes: int = field(default=0, init=False, repr=False)
+    __bits: bytearray = field(default_factory=bytearray, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.__size = max(
+            8, math.ceil(-self.capacity * math.log(self.error_rate) / math.log(2) ** 2)
+        )
+        self.__hashes = max(1, round(self.__size / self.capacity * math.log(2)))
+        self.__bits = bytearray((self.__size + 7) // 8)
+
+    @property
+    def size_in_bytes(self) -> int:
+        return len(self.__bits)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.__bits
+        return all(
+            bits[index >> 3] & (1 << (index & 7)) for index in self.__indexes(item)
+        )
+
+    def add(self, item: str) -> bool:
+        """
+        Add the item and return True if it was not seen before
+        """
+        bits = self.__bits
+        new = False
+        for index in self.__indexes(item):
+            mask = 1 << (index & 7)
+            if not bits[index >> 3] & mask:
+                bits[index >> 3] |= mask
+                new = True
+
+        if new:
+            self.count += 1
+
+        return new
+
+    def save(self, path: Path | str) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(BLOOM_MAGIC)
+            file.write(
+                BLOOM_HEADER.pack(
+                    self.capacity,
+                    self.error_rate,
+                    self.count,
+                    self.__size,
+                    self.__hashes,
+                )
+            )
+            file.write(self.__bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path | str) -> Self:
+        with open(path, "rb") as file:
+            if file.read(len(BLOOM_MAGIC)) != BLOOM_MAGIC:
+                raise ValueError(f"Not a Bloom filter file: {path}")
+
+            capacity, error_rate, count, size, hashes = BLOOM_HEADER.unpack(
+                file.read(BLOOM_HEADER.size)
+            )
+            bloom = cls(capacity=capacity, error_rate=error_rate, count=count)
+            if (size, hashes) != (bloom.__size, bloom.__hashes):
+                raise ValueError(f"Corrupted Bloom filter file: {path}")
+
+            bits = file.read()
+            if len(bits) != len(bloom.__bits):
+                raise ValueError(f"Truncated Bloom filter file: {path}")
+            bloom.__bits[:] = bits
+
+        return bloom
+
+    def __indexes(self, item: str) -> Iterable[int]:
+        # ? Double hashing (Kirsch-Mitzenmacher) with two halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        size = self.__size
+
+        return ((first + i * second) % size for i in range(self.__hashes))
+
+
+async def harvest_links(
+    document: Document,
+    base_url: str | None = None,
+    *,
+    seen: BloomFilter | None = None,
+    selector: str = "a[href]",
+    attribute: str = "href",
+) -> list[str]:
+    """
+    Extract the normalized links of the document, and if the filter of the seen URLs is provided, then only return the new ones (and add them to the filter)
+    """
+    if not isinstance(document, LinkHarvester):
+        raise TypeError(
+            f"Link harvesting is not supported for document type: {type(document).__name__}"
+        )
+
+    links = await document.links(base_url, selector=selector, attribute=attribute)
+    if seen is None:
+        return links
+
+    return [link for link in links if seen.add(link)]
@@ -22,17 +22,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Protocol
 
 from dunia.error import (
     LoginInputNotFound,
     PasswordInputNotFound,
+    PlaywrightError,
     PlaywrightTimeoutError,
 )
-from dunia.log import success
+from dunia.log import debug, info, success, warning
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+    from typing import Any
+
+    import playwright.async_api as playwright
+
     from dunia.playwright._types import PlaywrightBrowser, PlaywrightPage
 
 
@@ -53,6 +65,41 @@ async def default_login_button_strategy(
     )  # ? "load" is fine for most websites, but some websites don't show full page details until all the network requests are resolved, so for that "networkidle" can be used
 
 
+@dataclass(slots=True, frozen=True, kw_only=True)
+class SessionCache:
+    """
+    Where to persist the storage state (cookies and local storage) after login, and how to check that the saved session is still valid
+    """
+
+    path: Path | str = field(metadata={"help": "Storage state file of the session"})
+    probe_url: str | None = field(
+        default=None,
+        metadata={
+            "help": "URL that only responds with 2xx (without redirecting to login page) when logged in. It is requested without rendering"
+        },
+    )
+    session_cookies: tuple[str, ...] = field(
+        default=(),
+        metadata={
+            "help": "Names of the cookies that must be present and not expired for the session to be valid"
+        },
+    )
+    max_age: float | None = field(
+        default=None,
+        metadata={"help": "Time in seconds after which the saved session is stale"},
+    )
+    lock_timeout: float = field(
+        default=300.0,
+        metadata={
+            "help": "Time in seconds after which the lock of another process (i.e., crashed while logging in) is considered stale"
+        },
+    )
+
+    @property
+    def lock_path(self) -> str:
+        return f"{self.path}.lock"
+
+
 @dataclass(slots=True, frozen=True, kw_only=True)
 class LoginInfo:
     """
@@ -90,6 +137,12 @@ class LoginInfo:
             'In that case, we can say that it doesn\'t necessarily needs to be login "button" strategy, but anything that can successfully submit the form'
         },
     )
+    session: SessionCache | None = field(
+        default=None,
+        metadata={
+            "help": "Persist the session after login and reuse it on the next start (in any process) while it is valid"
+        },
+    )
 
 
 @dataclass(slots=True, frozen=True)
@@ -144,3 +197,152 @@ class Login:
             )
 
         await page.close()
+
+
+def read_session(session: SessionCache) -> list[Any] | None:
+    """
+    Read the cookies of the saved session, None if it is missing, stale or any of the session cookies has expired
+    """
+    try:
+        if (
+            session.max_age is not None
+            and time.time() - os.path.getmtime(session.path) > session.max_age
+        ):
+            debug(f"Saved session is stale: {session.path}")
+            return None
+
+        with open(session.path, encoding="utf-8") as file:
+            storage_state = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    cookies: list[Any] = storage_state.get("cookies", [])
+    now = time.time()
+    for name in session.session_cookies:
+        if not any(
+            cookie.get("name") == name
+            and (cookie.get("expires", -1) < 0 or cookie["expires"] > now)
+            for cookie in cookies
+        ):
+            debug(f"Session cookie ({name}) is missing or expired")
+            return None
+
+    return cookies
+
+
+async def load_session(
+    context: playwright.BrowserContext, session: SessionCache
+) -> bool:
+    """
+    Add the cookies of the saved session to the context and check if the session is still valid
+
+    If the probe fails, then the added cookies are cleared, so they don't interfere with the fresh login
+    """
+    cookies = await asyncio.to_thread(read_session, session)
+    if cookies is None:
+        return False
+
+    if cookies:
+        await context.add_cookies(cookies)
+
+    if await probe_session(context, session):
+        return True
+
+    if cookies:
+        await context.clear_cookies()
+
+    return False
+
+
+async def probe_session(
+    context: playwright.BrowserContext, session: SessionCache
+) -> bool:
+    if not session.probe_url:
+        return True
+
+    try:
+        response = await context.request.get(session.probe_url, max_redirects=0)
+    except (PlaywrightTimeoutError, PlaywrightError) as err:
+        warning(f"Could not probe the session ({err})")
+        return False
+
+    debug(f"Session probe ({session.probe_url}) status: {response.status}")
+    return response.ok
+
+
+async def save_session(
+    context: playwright.BrowserContext, session: SessionCache
+) -> None:
+    tmp = f"{session.path}.tmp"
+    await asyncio.to_thread(
+        os.makedirs, os.path.dirname(os.path.abspath(session.path)), exist_ok=True
+    )
+    await context.storage_state(path=tmp)
+    await asyncio.to_thread(os.replace, tmp, session.path)
+
+
+@asynccontextmanager
+async def session_lock(session: SessionCache) -> AsyncIterator[None]:
+    """
+    Cross-process lock (lock file created exclusively) so that only one process logs in at a time
+    """
+    while True:
+        try:
+            descriptor = os.open(
+                session.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY
+            )
+        except FileExistsError:
+            try:
+                if (
+                    time.time() - os.path.getmtime(session.lock_path)
+                    > session.lock_timeout
+                ):
+                    warning(f"Removing stale session lock: {session.lock_path}")
+                    os.remove(session.lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+
+            await asyncio.sleep(0.5)
+        else:
+            os.write(descriptor, str(os.getpid()).encode())
+            os.close(descriptor)
+            break
+
+    try:
+        yield
+    finally:
+        try:
+            os.remove(session.lock_path)
+        except FileNotFoundError:
+            pass
+
+
+async def login_with_session(
+    browser: PlaywrightBrowser,
+    context: playwright.BrowserContext,
+    login_info: LoginInfo,
+) -> None:
+    """
+    Reuse the saved session if it is valid, otherwise login (only one process at a time) and save the session
+    """
+    session = login_info.session
+    if not session:
+        await Login(login_info)(browser)
+        return
+
+    if await load_session(context, session):
+        info(f"Reusing the saved session: <blue>{session.path}</>")
+        return
+
+    async with session_lock(session):
+        # ? Another process might have logged in while we were waiting for the lock
+        if await load_session(context, session):
+            info(
+                f"Reusing the session saved by another process: <blue>{session.path}</>"
+            )
+            return
+
+        await Login(login_info)(browser)
+        await save_session(context, session)
+        info(f"Session is saved: <blue>{session.path}</>")
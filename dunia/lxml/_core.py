@@ -65,3 +65,20 @@ def inner_text(tree: lxml.HtmlElement, selector: str) -> str | None:
 def get_attribute(tree: lxml.HtmlElement, selector: str, name: str) -> str | None:
     handles = cssselect(tree, selector)
     return handles[0].get(name, None) if len(handles) else None
+
+
+def attribute_values(
+    tree: lxml.HtmlElement, selector: str, name: str
+) -> tuple[list[str], str | None]:
+    """
+    Values of the attribute of all the matched elements, and <base href> of the document
+    """
+    values: list[str] = [
+        value
+        for handle in cssselect(tree, selector)
+        if (value := handle.get(name)) is not None
+    ]
+
+    base = cast(list[str], tree.xpath("//base/@href"))
+
+    return values, str(base[0]) if base else None
@@ -26,7 +26,14 @@ import asyncio
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from dunia.lxml._core import cssselect, get_attribute, inner_text, text_content
+from dunia.links import resolve_links
+from dunia.lxml._core import (
+    attribute_values,
+    cssselect,
+    get_attribute,
+    inner_text,
+    text_content,
+)
 
 if TYPE_CHECKING:
     from typing import Self
@@ -63,6 +70,21 @@ class LXMLDocument:
     ) -> str | None:
         return await asyncio.to_thread(get_attribute, self.handle, selector, name)
 
+    async def links(
+        self,
+        base_url: str | None = None,
+        *,
+        selector: str = "a[href]",
+        attribute: str = "href",
+    ) -> list[str]:
+        def harvest() -> list[str]:
+            hrefs, document_base = attribute_values(
+                self.handle, selector, attribute  # type: ignore
+            )
+            return resolve_links(hrefs, base_url, document_base)
+
+        return await asyncio.to_thread(harvest)
+
 
 @dataclass(slots=True, frozen=True)
 class LXMLElement:
@@ -0,0 +1,222 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.helpers import compile_regex
+from dunia.log import debug
+
+if TYPE_CHECKING:
+    from re import Match
+    from typing import Final
+
+    from dunia.html import HTML
+
+
+TOKEN_REGEX: Final[str] = (
+    r"(?is)(?P<comment><!--.*?-->)"
+    r"""|(?P<raw>(?P<open><(?P<raw_tag>script|style|pre|textarea)\b(?:[^>"']|"[^"]*"|'[^']*')*>)(?P<body>.*?)(?P<close></(?P=raw_tag)\s*>))"""
+    r"""|(?P<tag></?[a-zA-Z!?](?:[^>"']|"[^"]*"|'[^']*')*>)"""
+)
+TAG_REGEX: Final[str] = (
+    r"(?s)^<(?P<name>[a-zA-Z][^\s/>]*)(?P<attributes>.*?)(?P<self_closing>/?)>$"
+)
+ATTRIBUTE_REGEX: Final[str] = (
+    r"""(?s)\s*(?P<name>[^\s"'>/=]+)(?:\s*=\s*(?P<value>"[^"]*"|'[^']*'|[^\s"'=<>`]+))?"""
+)
+SCRIPT_TYPE_REGEX: Final[str] = r"""(?is)\btype\s*=\s*["']?\s*([^"'\s>]+)"""
+
+# ? Scripts of these types contain JavaScript, other types (i.e., "application/ld+json") usually contain data that is extracted
+JAVASCRIPT_TYPES: Final[frozenset[str]] = frozenset(
+    {
+        "text/javascript",
+        "application/javascript",
+        "application/x-javascript",
+        "text/ecmascript",
+        "application/ecmascript",
+        "module",
+    }
+)
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class MinifyConfig:
+    """
+    Configuration of the HTML minification/normalization before saving it to disk
+
+    Minification doesn't change the element tree (tags and attributes) or the text of the elements, so the selector results stay identical, except for the text content of the ancestors of whitespace-only text collapsed with 'collapse_whitespace'
+    """
+
+    strip_comments: bool = field(
+        default=True, metadata={"help": "Remove the HTML comments"}
+    )
+    collapse_whitespace: bool = field(
+        default=False,
+        metadata={
+            "help": "Collapse the whitespace-only text between the tags (i.e., indentation) into a single space. Text with any other characters is kept as it is"
+        },
+    )
+    normalize_tags: bool = field(
+        default=True,
+        metadata={
+            "help": "Remove the repeated attributes (browsers and parsers only use the first one) and the extra whitespace inside the tags"
+        },
+    )
+    drop_scripts: bool = field(
+        default=False,
+        metadata={
+            "help": "Drop the bodies of JavaScript <script> elements. Data scripts (i.e., JSON-LD) are kept"
+        },
+    )
+    drop_styles: bool = field(
+        default=False, metadata={"help": "Drop the bodies of <style> elements"}
+    )
+
+
+def normalize_tag(tag: str) -> str:
+    if not (match := compile_regex(TAG_REGEX).match(tag)):
+        return tag
+
+    attributes = match["attributes"]
+    seen: set[str] = set()
+    parts = [f"<{match['name']}"]
+    position = 0
+
+    for attribute in compile_regex(ATTRIBUTE_REGEX).finditer(attributes):
+        if attribute.start() != position:
+            break
+
+        position = attribute.end()
+        name = attribute["name"]
+        if name.lower() in seen:
+            continue
+
+        seen.add(name.lower())
+        parts.append(
+            f" {name}={attribute['value']}" if attribute["value"] else f" {name}"
+        )
+
+    # ? Tag has something that couldn't be tokenized as attributes, so let's keep it as it is to be safe
+    if attributes[position:].strip():
+        return tag
+
+    parts.append(f"{match['self_closing']}>")
+    return "".join(parts)
+
+
+def is_javascript(open_tag: str) -> bool:
+    if match := compile_regex(SCRIPT_TYPE_REGEX).search(open_tag):
+        return match[1].lower() in JAVASCRIPT_TYPES
+
+    return True
+
+
+def minify(content: str, config: MinifyConfig = MinifyConfig()) -> str:
+    """
+    Minify/normalize the HTML content according to the config
+    """
+    parts: list[str] = []
+    position = 0
+
+    def text(value: str) -> str:
+        if config.collapse_whitespace and value and value.isspace():
+            return " "
+
+        return value
+
+    def tag(value: str) -> str:
+        return normalize_tag(value) if config.normalize_tags else value
+
+    match: Match[str]
+    for match in compile_regex(TOKEN_REGEX).finditer(content):
+        parts.append(text(content[position : match.start()]))
+        position = match.end()
+
+        if comment := match["comment"]:
+            if not config.strip_comments:
+                parts.append(comment)
+        elif match["raw"]:
+            raw_tag = match["raw_tag"].lower()
+            body = match["body"]
+
+            if (
+                raw_tag == "script"
+                and config.drop_scripts
+                and is_javascript(match["open"])
+            ) or (raw_tag == "style" and config.drop_styles):
+                body = ""
+
+            parts.append(f"{tag(match['open'])}{body}{match['close']}")
+        else:
+            parts.append(tag(match["tag"]))
+
+    parts.append(text(content[position:]))
+
+    return "".join(parts)
+
+
+@dataclass(slots=True)
+class MinifiedHTML:
+    """
+    HTML wrapper that minifies the content before saving it with the wrapped HTML
+
+    It can be used anywhere HTML is accepted (i.e., in place of your own HTML implementation), and keeps track of the bytes saved by the minification
+    """
+
+    html: HTML
+    config: MinifyConfig = field(default_factory=MinifyConfig)
+    original_bytes: int = field(default=0, init=False)
+    minified_bytes: int = field(default=0, init=False)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.minified_bytes
+
+    @property
+    def directory(self) -> str:
+        return self.html.directory
+
+    @property
+    def file(self) -> str:
+        return self.html.file
+
+    async def exists(self) -> bool:
+        return await self.html.exists()
+
+    async def load(self) -> str:
+        return await self.html.load()
+
+    async def save(self, content: str) -> None:
+        minified = await asyncio.to_thread(minify, content, self.config)
+
+        original_size = len(content.encode())
+        minified_size = len(minified.encode())
+        self.original_bytes += original_size
+        self.minified_bytes += minified_size
+        debug(
+            f"Minified HTML: {original_size} -> {minified_size} bytes ({self.html.file})"
+        )
+
+        await self.html.save(minified)
@@ -56,3 +56,19 @@ async def css(document_or_node: HTMLParser | Node, selector: str):
         return [handle for handles in all_css for handle in handles]
 
     return await asyncio.to_thread(document_or_node.css, selector)
+
+
+def attribute_values(
+    document: HTMLParser, selector: str, name: str
+) -> tuple[list[str], str | None]:
+    """
+    Values of the attribute of all the matched elements, and <base href> of the document
+    """
+    values = [
+        value
+        for node in document.css(selector)
+        if (value := node.attributes.get(name)) is not None
+    ]
+    base = document.css_first("base[href]")
+
+    return values, base.attributes.get("href") if base else None
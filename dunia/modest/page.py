@@ -26,7 +26,8 @@ import asyncio
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from dunia.modest._core import css, css_first
+from dunia.links import resolve_links
+from dunia.modest._core import attribute_values, css, css_first
 
 if TYPE_CHECKING:
     from typing import Self
@@ -74,6 +75,19 @@ class ModestDocument:
 
         return None
 
+    async def links(
+        self,
+        base_url: str | None = None,
+        *,
+        selector: str = "a[href]",
+        attribute: str = "href",
+    ) -> list[str]:
+        def harvest() -> list[str]:
+            hrefs, document_base = attribute_values(self.handle, selector, attribute)
+            return resolve_links(hrefs, base_url, document_base)
+
+        return await asyncio.to_thread(harvest)
+
 
 @dataclass(slots=True, frozen=True)
 class ModestElement:
@@ -28,10 +28,27 @@ from dunia.playwright._types import (
     PlaywrightPage,
 )
 from dunia.playwright.browser import AsyncPlaywrightBrowser
+from dunia.playwright.contexts import BrowserContextPool, ContextStats
+from dunia.playwright.pool import PagePool
+from dunia.playwright.readiness import (
+    DOMStable,
+    Expression,
+    Readiness,
+    Selector,
+    wait_until_ready,
+)
 
 __all__ = [
     "PlaywrightBrowser",
     "AsyncPlaywrightBrowser",
     "PlaywrightPage",
     "PlaywrightElementHandle",
+    "PagePool",
+    "BrowserContextPool",
+    "ContextStats",
+    "Readiness",
+    "Selector",
+    "Expression",
+    "DOMStable",
+    "wait_until_ready",
 ]
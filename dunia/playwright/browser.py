@@ -22,6 +22,9 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
@@ -29,11 +32,16 @@ import playwright.async_api as playwright
 
 from dunia.error import BrowserNotInitialized
 from dunia.log import info
-from dunia.login import Login
+from dunia.login import login_with_session
 from dunia.playwright._types import PlaywrightBrowser, PlaywrightPage
+from dunia.playwright.contexts import BrowserContextPool
+from dunia.playwright.pool import PagePool
+from dunia.playwright.routing import RequestBlocker, apply_routing
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
     from pathlib import Path
+    from typing import Any, Literal
 
     from dunia.browser import BrowserConfig
     from dunia.login import LoginInfo
@@ -48,29 +56,245 @@ class AsyncPlaywrightBrowser(PlaywrightBrowser):
     browser_config: BrowserConfig
     playwright: playwright.Playwright
     login_info: LoginInfo | None = None
+    page_pool_size: int | None = field(
+        default=None,
+        metadata={
+            "help": "Number of pages to pre-create and reuse with lease_page(). It also caps the number of concurrently leased pages"
+        },
+    )
+    startup: Literal["eager", "lazy", "background"] = field(
+        default="eager",
+        metadata={
+            "help": 'When to launch the browser: in create() ("eager"), on first need, i.e., new_page() or fetching ("lazy"), or in the background right after create() while the cached work runs ("background")'
+        },
+    )
+    prewarm: bool = field(
+        default=False,
+        metadata={
+            "help": "Open a blank page after launch to prime the renderer process"
+        },
+    )
 
     __browser_context: playwright.BrowserContext | None = field(
         default=None,
         init=False,
         repr=False,
     )
+    __page_pool: PagePool | None = field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+    __browser: playwright.Browser | None = field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+    __context_pool: BrowserContextPool | None = field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+    __request_blocker: RequestBlocker | None = field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+    __launch: asyncio.Task[None] | None = field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+
+    @property
+    def page_pool(self) -> PagePool | None:
+        return self.__page_pool
+
+    @property
+    def context_pool(self) -> BrowserContextPool | None:
+        return self.__context_pool
+
+    @property
+    def request_blocker(self) -> RequestBlocker | None:
+        """
+        Counters of the requests blocked by the routing profile
+        """
+        return self.__request_blocker
+
+    @property
+    def started(self) -> bool:
+        launch = self.__launch
+        return bool(
+            launch
+            and launch.done()
+            and not launch.cancelled()
+            and not launch.exception()
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # ? Inherited BrowserContext APIs (i.e., cookies(), route()) need the launched context
+        if name == "_impl_obj":
+            raise BrowserNotInitialized(
+                f'Browser hasn\'t been started yet (startup="{self.startup}"), please await start() before using the BrowserContext API'
+            )
+
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
 
     async def create(self) -> PlaywrightBrowser:
-        self.__browser_context = await create_playwright_persistent_browser(self)
-        self._impl_obj = self.__browser_context
+        if self.browser_config.routing:
+            self.__request_blocker = RequestBlocker(profile=self.browser_config.routing)
 
-        if self.login_info:
-            login = Login(self.login_info)
-            await login(self)
+        match self.startup:
+            case "eager":
+                await self.start()
+            case "background":
+                self.start_in_background()
+            case "lazy":
+                pass
 
         return self
 
-    async def new_page(self) -> PlaywrightPage:
+    async def start(self) -> None:
+        """
+        Launch the browser if it hasn't been launched yet, concurrent callers wait for the same launch
+        """
+        launch = self.start_in_background()
+
+        # ? Login creates the page while launching
+        if asyncio.current_task() is launch:
+            return
+
+        try:
+            await asyncio.shield(launch)
+        except BaseException:
+            if launch.done() and not launch.cancelled() and launch.exception():
+                # ? Let the next call try again
+                self.__launch = None
+            raise
+
+    def start_in_background(self) -> asyncio.Task[None]:
+        if not self.__launch:
+            self.__launch = asyncio.create_task(self.__start())
+
+        return self.__launch
+
+    async def __start(self) -> None:
+        started = time.perf_counter()
+
+        if self.browser_config.context_pool_size:
+            await self.__create_context_pool(self.browser_config.context_pool_size)
+        else:
+            self.__browser_context = await create_playwright_persistent_browser(self)
+            self._impl_obj = self.__browser_context._impl_obj
+
+            if self.login_info:
+                await login_with_session(self, self.__browser_context, self.login_info)
+
+        if self.page_pool_size:
+            context_pool = self.__context_pool
+            self.__page_pool = PagePool(
+                new_page=self.__new_page,
+                size=self.page_pool_size,
+                match=(
+                    context_pool.owns
+                    if context_pool
+                    and self.browser_config.context_strategy == "host_affinity"
+                    else None
+                ),
+            )
+            await self.__page_pool.start()
+
+        if self.prewarm:
+            page = await self.__new_page()
+            await page.set_content("<html><body></body></html>")
+            await page.evaluate("() => document.body.offsetHeight")
+            await page.close()
+
+        info(
+            f"Browser is started in <blue>{time.perf_counter() - started:.2f}</> seconds"
+        )
+
+    async def __create_context_pool(self, size: int) -> None:
+        self.__browser = await create_playwright_browser(self)
+
+        # ? Login only once in the first context and seed the rest of the contexts with its storage state
+        first_context = await create_playwright_context(
+            self, self.__browser, self.browser_config.storage_state
+        )
+        self.__browser_context = first_context
+        self._impl_obj = first_context._impl_obj
+
+        storage_state = self.browser_config.storage_state
+        if self.login_info:
+            await login_with_session(self, first_context, self.login_info)
+            storage_state = await first_context.storage_state()
+
+        contexts = await asyncio.gather(
+            *(
+                create_playwright_context(self, self.__browser, storage_state)
+                for _ in range(size - 1)
+            )
+        )
+        self.__context_pool = BrowserContextPool(
+            contexts=[first_context, *contexts],
+            strategy=self.browser_config.context_strategy,
+        )
+        info(f"Browser is launched with <blue>{size}</> contexts")
+
+    async def new_page(self, url: str | None = None) -> PlaywrightPage:
+        """
+        Create a new page. In the context pool mode, the URL that is going to be visited is used for picking the context with "host_affinity" strategy
+        """
+        await self.start()
+
+        return await self.__new_page(url)
+
+    async def __new_page(self, url: str | None = None) -> PlaywrightPage:
+        if self.__context_pool:
+            return await self.__context_pool.new_page(url)
+
         if not self.__browser_context:
             raise BrowserNotInitialized("Please call create() first")
 
         return await self.__browser_context.new_page()
 
+    async def close(self, *, reason: str | None = None) -> None:
+        if self.__launch and not self.__launch.done():
+            self.__launch.cancel()
+            await asyncio.gather(self.__launch, return_exceptions=True)
+
+        if self.__page_pool:
+            await self.__page_pool.close()
+
+        if self.__context_pool:
+            await self.__context_pool.close()
+
+        if self.__browser:
+            await self.__browser.close(reason=reason)
+        elif self.__browser_context:
+            await self.__browser_context.close(reason=reason)
+
+    @asynccontextmanager
+    async def lease_page(self, url: str | None = None) -> AsyncIterator[PlaywrightPage]:
+        """
+        Lease a page from the page pool, or create a new page (that is closed afterwards) if the pool is not configured
+
+        The URL that is going to be visited is used for picking the context with "host_affinity" strategy
+        """
+        await self.start()
+
+        if self.__page_pool:
+            async with self.__page_pool.lease(url) as page:
+                yield page
+        else:
+            page = await self.new_page(url)
+            try:
+                yield page
+            finally:
+                await page.close()
+
 
 async def create_playwright_persistent_browser(
     browser: AsyncPlaywrightBrowser,
@@ -127,4 +351,67 @@ async def create_playwright_persistent_browser(
     )
     persistent_browser.set_default_timeout(browser.browser_config.default_timeout)
 
+    await apply_routing(persistent_browser, browser.request_blocker)
+
     return persistent_browser
+
+
+async def create_playwright_browser(
+    browser: AsyncPlaywrightBrowser,
+) -> playwright.Browser:
+    """
+    This launches the browser without any context, the isolated contexts are created with create_playwright_context()
+    """
+    browser_args: dict[str, str | bool | int | playwright.ProxySettings] = dict(
+        headless=browser.browser_config.headless,
+        channel=browser.browser_config.channel,
+        devtools=browser.browser_config.devtools,
+    )
+
+    if browser.browser_config.slow_mo:
+        browser_args["slow_mo"] = browser.browser_config.slow_mo
+
+    if browser.browser_config.proxy:
+        browser_args["proxy"] = browser.browser_config.proxy
+
+    if browser.browser_config.browser == "chromium":
+        return await browser.playwright.chromium.launch(**browser_args)  # type: ignore
+
+    return await browser.playwright.firefox.launch(**browser_args)  # type: ignore
+
+
+async def create_playwright_context(
+    browser: AsyncPlaywrightBrowser,
+    playwright_browser: playwright.Browser,
+    storage_state: Path | str | playwright.StorageState | None = None,
+) -> playwright.BrowserContext:
+    """
+    This creates the isolated (non-persistent) context in the browser, optionally seeded with the storage state (cookies and local storage)
+    """
+    context_args: dict[
+        str,
+        Path | str | bool | playwright.ViewportSize | playwright.StorageState,
+    ] = dict(
+        locale=browser.browser_config.locale,
+        accept_downloads=browser.browser_config.accept_downloads,
+        ignore_https_errors=True,
+    )
+
+    if browser.browser_config.viewport:
+        context_args["viewport"] = browser.browser_config.viewport
+    else:
+        context_args["no_viewport"] = True
+
+    if storage_state:
+        context_args["storage_state"] = storage_state
+
+    context = await playwright_browser.new_context(**context_args)  # type: ignore
+
+    context.set_default_navigation_timeout(
+        browser.browser_config.default_navigation_timeout
+    )
+    context.set_default_timeout(browser.browser_config.default_timeout)
+
+    await apply_routing(context, browser.request_blocker)
+
+    return context
@@ -0,0 +1,113 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.helpers import host_of
+
+if TYPE_CHECKING:
+    from typing import Literal
+
+    import playwright.async_api as playwright
+
+    from dunia.playwright._types import PlaywrightPage
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ContextStats:
+    index: int
+    open_pages: int = field(metadata={"help": "Number of currently open pages"})
+    total_pages: int = field(metadata={"help": "Number of pages created so far"})
+    hosts: int = field(metadata={"help": "Number of hosts pinned to the context"})
+
+
+@dataclass(slots=True, kw_only=True)
+class BrowserContextPool:
+    """
+    Isolated (separate cookie jar, cache and storage) browser contexts of one browser that the new pages are spread across
+
+    "least_loaded" creates the page in the context with the fewest open pages, "host_affinity" pins every host to one context (the least loaded one when the host is seen first), so the session of a website stays in one cookie jar
+    """
+
+    contexts: list[playwright.BrowserContext]
+    strategy: Literal["least_loaded", "host_affinity"] = "least_loaded"
+
+    __open_pages: list[int] = field(default_factory=list, init=False, repr=False)
+    __total_pages: list[int] = field(default_factory=list, init=False, repr=False)
+    __hosts: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.contexts:
+            raise ValueError("At least one browser context is required")
+
+        self.__open_pages = [0] * len(self.contexts)
+        self.__total_pages = [0] * len(self.contexts)
+
+    def pick(self, url: str | None = None) -> int:
+        least_loaded = min(range(len(self.contexts)), key=self.__open_pages.__getitem__)
+
+        if self.strategy == "least_loaded" or url is None:
+            return least_loaded
+
+        return self.__hosts.setdefault(host_of(url), least_loaded)
+
+    def owns(self, page: PlaywrightPage, url: str | None = None) -> bool:
+        """
+        Whether the page belongs to the context that would be picked for the URL
+        """
+        return page.context is self.contexts[self.pick(url)]
+
+    async def new_page(self, url: str | None = None) -> PlaywrightPage:
+        index = self.pick(url)
+
+        # ? Reserve the slot before creating the page, so that the concurrent calls are spread across the contexts
+        self.__open_pages[index] += 1
+        try:
+            page = await self.contexts[index].new_page()
+        except BaseException:
+            self.__open_pages[index] -= 1
+            raise
+
+        self.__total_pages[index] += 1
+        page.once("close", lambda _: self.__closed(index))
+
+        return page
+
+    def stats(self) -> list[ContextStats]:
+        return [
+            ContextStats(
+                index=index,
+                open_pages=self.__open_pages[index],
+                total_pages=self.__total_pages[index],
+                hosts=sum(1 for value in self.__hosts.values() if value == index),
+            )
+            for index in range(len(self.contexts))
+        ]
+
+    async def close(self) -> None:
+        await asyncio.gather(*(context.close() for context in self.contexts))
+
+    def __closed(self, index: int) -> None:
+        self.__open_pages[index] -= 1
@@ -0,0 +1,176 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.error import PlaywrightError
+from dunia.log import debug, warning
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+    from typing import Any
+
+    from dunia.playwright._types import PlaywrightPage
+
+
+@dataclass(slots=True, kw_only=True)
+class PagePool:
+    """
+    Pool of pre-created pages that are leased out and reset (about:blank, routes and listeners added during the lease are removed) between uses
+
+    The number of concurrently leased pages is capped by the pool size
+
+    If 'match' is provided, then only the idle pages that match the URL are leased for it (i.e., the pages of the context that the host is pinned to with "host_affinity" context strategy), otherwise an idle page is replaced with a new page for the URL
+    """
+
+    new_page: Callable[[str | None], Awaitable[PlaywrightPage]] = field(
+        metadata={
+            "help": "Factory for creating the pages of the pool from the URL that is going to be visited"
+        }
+    )
+    size: int = field(
+        default=8, metadata={"help": "Maximum number of concurrently leased pages"}
+    )
+    max_uses: int | None = field(
+        default=100,
+        metadata={
+            "help": "Page is closed and replaced after this many leases to keep the renderer's memory in check. Pass None to never replace"
+        },
+    )
+    match: Callable[[PlaywrightPage, str | None], bool] | None = field(
+        default=None,
+        metadata={"help": "Whether the idle page can be leased for the URL"},
+    )
+    created: int = field(default=0, init=False)
+    leased: int = field(default=0, init=False)
+    discarded: int = field(default=0, init=False)
+
+    __idle: list[PlaywrightPage] = field(default_factory=list, init=False, repr=False)
+    __uses: dict[PlaywrightPage, int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    __listeners: dict[PlaywrightPage, dict[str, list[Any]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    __semaphore: asyncio.Semaphore | None = field(default=None, init=False, repr=False)
+
+    @property
+    def in_use(self) -> int:
+        return len(self.__uses) - len(self.__idle)
+
+    async def start(self) -> None:
+        """
+        Pre-create all the pages of the pool
+        """
+        self.__semaphore = asyncio.Semaphore(self.size)
+        pages = await asyncio.gather(
+            *(self.__create() for _ in range(self.size - len(self.__uses)))
+        )
+        self.__idle.extend(pages)
+        debug(f"Page pool is started with {len(self.__uses)} pages")
+
+    @asynccontextmanager
+    async def lease(self, url: str | None = None) -> AsyncIterator[PlaywrightPage]:
+        if not self.__semaphore:
+            raise RuntimeError("Please call start() first")
+
+        async with self.__semaphore:
+            page = await self.__take(url)
+            self.__uses[page] += 1
+            self.leased += 1
+
+            try:
+                yield page
+            finally:
+                if await self.__reset(page):
+                    self.__idle.append(page)
+                else:
+                    await self.__discard(page)
+
+    async def close(self) -> None:
+        pages = list(self.__uses)
+        self.__idle.clear()
+        await asyncio.gather(*(self.__discard(page) for page in pages))
+
+    async def __take(self, url: str | None) -> PlaywrightPage:
+        for index in range(len(self.__idle) - 1, -1, -1):
+            if not self.match or self.match(self.__idle[index], url):
+                return self.__idle.pop(index)
+
+        # ? Keep the number of pages within the pool size by replacing an idle page that doesn't match the URL
+        if self.__idle:
+            await self.__discard(self.__idle.pop(0))
+
+        return await self.__create(url)
+
+    async def __create(self, url: str | None = None) -> PlaywrightPage:
+        page = await self.new_page(url)
+        self.created += 1
+        self.__uses[page] = 0
+        self.__listeners[page] = listeners(page)
+        return page
+
+    async def __reset(self, page: PlaywrightPage) -> bool:
+        if page.is_closed() or (
+            self.max_uses is not None and self.__uses[page] >= self.max_uses
+        ):
+            return False
+
+        try:
+            remove_new_listeners(page, self.__listeners[page])
+            await page.unroute_all(behavior="ignoreErrors")
+            await page.goto("about:blank")
+        except PlaywrightError as err:
+            warning(f"Could not reset the page, it will be replaced -> {err}")
+            return False
+
+        return True
+
+    async def __discard(self, page: PlaywrightPage) -> None:
+        self.__uses.pop(page, None)
+        self.__listeners.pop(page, None)
+        self.discarded += 1
+
+        if not page.is_closed():
+            try:
+                await page.close()
+            except PlaywrightError:
+                pass
+
+
+# ? Playwright doesn't provide public API for listing the event listeners, so we need to look into the underlying event emitter
+# ? Page registers some listeners for itself when it is created, so only the listeners added after that are removed
+def listeners(page: PlaywrightPage) -> dict[str, list[Any]]:
+    emitter: Any = page._impl_obj  # type: ignore
+    return {event: list(emitter.listeners(event)) for event in emitter.event_names()}
+
+
+def remove_new_listeners(page: PlaywrightPage, initial: dict[str, list[Any]]) -> None:
+    emitter: Any = page._impl_obj  # type: ignore
+    for event, current in listeners(page).items():
+        for listener in current:
+            if listener not in initial.get(event, ()):
+                emitter.remove_listener(event, listener)
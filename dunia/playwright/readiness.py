@@ -0,0 +1,129 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from typing import Final, Literal
+
+    from dunia.playwright._types import PlaywrightPage
+
+
+# ? Installs a MutationObserver once per document and reports whether the DOM has been quiet for the given time
+DOM_STABLE_SCRIPT: Final[str] = """
+(quiet) => {
+    const state = (window.__duniaDomStable ??= (() => {
+        const state = { last: performance.now() };
+        new MutationObserver(() => {
+            state.last = performance.now();
+        }).observe(document, {
+            childList: true,
+            subtree: true,
+            attributes: true,
+            characterData: true,
+        });
+        return state;
+    })());
+
+    return (
+        document.readyState !== "loading" && performance.now() - state.last >= quiet
+    );
+}
+"""
+
+
+class Readiness(Protocol):
+    """
+    Condition after which the visited page is ready for extraction
+    """
+
+    async def wait(self, page: PlaywrightPage, timeout: float | None) -> None: ...
+
+
+@dataclass(slots=True, frozen=True)
+class Selector:
+    """
+    Ready when the element matching the selector is in the DOM (or visible)
+    """
+
+    selector: str
+    state: Literal["attached", "visible"] = "attached"
+
+    async def wait(self, page: PlaywrightPage, timeout: float | None) -> None:
+        await page.wait_for_selector(self.selector, state=self.state, timeout=timeout)
+
+
+@dataclass(slots=True, frozen=True)
+class Expression:
+    """
+    Ready when the JavaScript expression (or function) returns a truthy value
+    """
+
+    expression: str
+    polling: float | Literal["raf"] = "raf"
+
+    async def wait(self, page: PlaywrightPage, timeout: float | None) -> None:
+        await page.wait_for_function(
+            self.expression, timeout=timeout, polling=self.polling
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class DOMStable:
+    """
+    Ready when the DOM has not been mutated for the quiet time (in milliseconds)
+    """
+
+    quiet: float = field(
+        default=500, metadata={"help": "Time in milliseconds without DOM mutations"}
+    )
+    polling: float = 100
+
+    async def wait(self, page: PlaywrightPage, timeout: float | None) -> None:
+        await page.wait_for_function(
+            DOM_STABLE_SCRIPT, arg=self.quiet, timeout=timeout, polling=self.polling
+        )
+
+
+async def wait_until_ready(
+    page: PlaywrightPage,
+    ready: Readiness | Sequence[Readiness],
+    *,
+    timeout: float | None = None,
+) -> None:
+    """
+    Wait for all of the readiness predicates concurrently (the remaining ones are cancelled if any of them fails)
+    """
+    predicates = ready if isinstance(ready, Sequence) else (ready,)
+    tasks = [
+        asyncio.ensure_future(predicate.wait(page, timeout)) for predicate in predicates
+    ]
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
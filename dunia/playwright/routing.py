@@ -0,0 +1,96 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.error import PlaywrightError
+from dunia.helpers import compile_regex, host_of
+
+if TYPE_CHECKING:
+    import playwright.async_api as playwright
+
+    from dunia.browser import RoutingProfile
+
+
+def matches_domain(host: str, domains: tuple[str, ...]) -> bool:
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+@dataclass(slots=True, kw_only=True)
+class RequestBlocker:
+    """
+    Route handler that aborts the requests blocked by the routing profile and counts them
+    """
+
+    profile: RoutingProfile
+    allowed: int = field(default=0, metadata={"help": "Number of allowed requests"})
+    blocked: int = field(default=0, metadata={"help": "Number of blocked requests"})
+    blocked_by_type: Counter[str] = field(
+        default_factory=Counter,
+        metadata={"help": "Number of blocked requests per resource type"},
+    )
+
+    def is_blocked(self, url: str, resource_type: str, site: str) -> bool:
+        if any(
+            compile_regex(pattern).search(url)
+            for pattern in self.profile.allow.get(site, ())
+        ):
+            return False
+
+        if matches_domain(host_of(url), self.profile.block_domains):
+            return True
+
+        # ? Never block the document itself, otherwise there is nothing to parse
+        if resource_type == "document":
+            return False
+
+        return resource_type in self.profile.block_resource_types or any(
+            compile_regex(pattern).search(url)
+            for pattern in self.profile.block_url_patterns
+        )
+
+    async def __call__(self, route: playwright.Route) -> None:
+        request = route.request
+
+        try:
+            site = host_of(request.frame.page.url) or host_of(request.url)
+        except PlaywrightError:
+            # ? Requests of service workers don't have any frame
+            site = host_of(request.url)
+
+        if self.is_blocked(request.url, request.resource_type, site):
+            self.blocked += 1
+            self.blocked_by_type[request.resource_type] += 1
+            await route.abort("blockedbyclient")
+        else:
+            self.allowed += 1
+            await route.fallback()
+
+
+async def apply_routing(
+    context: playwright.BrowserContext, blocker: RequestBlocker | None
+) -> None:
+    if blocker:
+        await context.route("**/*", blocker)
@@ -0,0 +1,196 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from dunia.helpers import host_of
+from dunia.log import debug
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class HostLimit:
+    rate: float = field(metadata={"help": "Number of requests allowed per second"})
+    burst: int = field(
+        default=1,
+        metadata={
+            "help": "Number of requests that can be sent at once after the host has been idle"
+        },
+    )
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class RateLimitStats:
+    host: str
+    rate: float
+    burst: int
+    acquired: int = field(metadata={"help": "Number of granted requests"})
+    throttled: int = field(
+        metadata={"help": "Number of requests that had to wait for a token"}
+    )
+    waited: float = field(metadata={"help": "Total waiting time in seconds"})
+
+
+class AsyncRateLimiter(Protocol):
+    async def acquire(self, url: str, rate: float | None = None) -> float: ...
+
+    def stats(self) -> dict[str, RateLimitStats]: ...
+
+
+@dataclass(slots=True, kw_only=True)
+class TokenBucket:
+    """
+    Token bucket that refills at the rate (tokens per second) up to the burst size
+    """
+
+    rate: float
+    burst: int
+    acquired: int = 0
+    throttled: int = 0
+    waited: float = 0.0
+
+    __tokens: float = field(default=0.0, init=False, repr=False)
+    __updated: float = field(default_factory=time.monotonic, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.burst < 1:
+            raise ValueError("rate must be positive and burst must be at least 1")
+
+        self.__tokens = float(self.burst)
+
+    def reserve(self) -> float:
+        """
+        Take a token and return the time in seconds to wait before using it
+
+        Tokens can go negative, so the concurrent callers are queued one after another instead of racing for the same token
+        """
+        now = time.monotonic()
+        self.__tokens = min(
+            float(self.burst), self.__tokens + (now - self.__updated) * self.rate
+        )
+        self.__updated = now
+        self.__tokens -= 1
+        self.acquired += 1
+
+        if self.__tokens >= 0:
+            return 0.0
+
+        delay = -self.__tokens / self.rate
+        self.throttled += 1
+        self.waited += delay
+        return delay
+
+    async def acquire(self) -> float:
+        if delay := self.reserve():
+            await asyncio.sleep(delay)
+
+        return delay
+
+
+@dataclass(slots=True, kw_only=True)
+class RateLimiter:
+    """
+    Registry of token buckets keyed by host, so the rate limit is shared by all the requests to the same host across concurrent calls
+    """
+
+    default: HostLimit = field(
+        default_factory=lambda: HostLimit(rate=10),
+        metadata={
+            "help": "Limit of the hosts that are not configured and no rate is passed to acquire()"
+        },
+    )
+    overrides: dict[str, HostLimit] = field(
+        default_factory=dict[str, HostLimit],
+        metadata={"help": "Per-host limits that take precedence over everything"},
+    )
+
+    __buckets: dict[str, TokenBucket] = field(
+        default_factory=dict[str, TokenBucket], init=False, repr=False
+    )
+
+    def configure(self, host: str, *, rate: float, burst: int = 1) -> None:
+        limit = HostLimit(rate=rate, burst=burst)
+        self.overrides[host.lower()] = limit
+        self.__buckets[host.lower()] = TokenBucket(rate=limit.rate, burst=limit.burst)
+
+    def bucket(self, url: str, rate: float | None = None) -> TokenBucket:
+        """
+        Get the bucket of the URL's host
+
+        The bucket is created on first use with the configured override, otherwise with the rate (i.e., "rate_limit" argument of the extraction functions), otherwise with the default limit
+        """
+        host = host_of(url)
+
+        if not (bucket := self.__buckets.get(host)):
+            if limit := self.overrides.get(host):
+                bucket = TokenBucket(rate=limit.rate, burst=limit.burst)
+            elif rate:
+                bucket = TokenBucket(rate=rate, burst=self.default.burst)
+            else:
+                bucket = TokenBucket(rate=self.default.rate, burst=self.default.burst)
+
+            self.__buckets[host] = bucket
+
+        return bucket
+
+    async def acquire(self, url: str, rate: float | None = None) -> float:
+        """
+        Wait until the request to the URL is allowed by its host's limit and return the time waited
+        """
+        delay = await self.bucket(url, rate).acquire()
+        if delay:
+            debug(f"Throttled for {delay:.2f} seconds: {url}")
+
+        return delay
+
+    def stats(self) -> dict[str, RateLimitStats]:
+        return {
+            host: RateLimitStats(
+                host=host,
+                rate=bucket.rate,
+                burst=bucket.burst,
+                acquired=bucket.acquired,
+                throttled=bucket.throttled,
+                waited=bucket.waited,
+            )
+            for host, bucket in self.__buckets.items()
+        }
+
+
+# ? Process-wide registry that is used by all the fetch and visit paths in extraction.py
+# ? Use set_rate_limiter(RateLimiter(overrides={...})) to configure the per-host limits
+_rate_limiter: AsyncRateLimiter = RateLimiter()
+
+
+def get_rate_limiter() -> AsyncRateLimiter:
+    return _rate_limiter
+
+
+def set_rate_limiter(rate_limiter: AsyncRateLimiter) -> None:
+    """
+    Replace the process-wide rate limiter (i.e., with a limiter that is shared by multiple processes)
+    """
+    global _rate_limiter
+    _rate_limiter = rate_limiter
@@ -0,0 +1,125 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.log import debug
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from dunia.html import HTML
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class Validators:
+    """
+    Validators of the cached response that are sent back with the conditional request
+    """
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> Validators:
+        return cls(etag=headers.get("etag"), last_modified=headers.get("last-modified"))
+
+    def __bool__(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+@dataclass(slots=True, kw_only=True)
+class RevalidationStats:
+    requests: int = field(
+        default=0, metadata={"help": "Number of conditional requests sent"}
+    )
+    revalidated: int = field(
+        default=0,
+        metadata={"help": "Number of 304 responses (cached content was reused)"},
+    )
+    modified: int = field(
+        default=0, metadata={"help": "Number of conditional requests with new content"}
+    )
+
+
+_revalidation_stats = RevalidationStats()
+
+
+def get_revalidation_stats() -> RevalidationStats:
+    return _revalidation_stats
+
+
+def validators_file(html: HTML) -> str:
+    """
+    Sidecar file that stores the validators next to the HTML file
+    """
+    return f"{html.file}.validators.json"
+
+
+async def load_validators(html: HTML) -> Validators:
+    def load() -> Validators:
+        try:
+            with open(validators_file(html), encoding="utf-8") as file:
+                return Validators(**json.load(file))
+        except (OSError, ValueError, TypeError):
+            return Validators()
+
+    return await asyncio.to_thread(load)
+
+
+async def save_validators(html: HTML, validators: Validators) -> None:
+    def save() -> None:
+        path = validators_file(html)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(asdict(validators), file)
+        os.replace(tmp, path)
+
+    debug(f"Saving validators ({validators}) for: {html.file}")
+    await asyncio.to_thread(save)
+
+
+async def delete_validators(html: HTML) -> None:
+    def delete() -> None:
+        try:
+            os.remove(validators_file(html))
+        except FileNotFoundError:
+            pass
+
+    debug(f"Deleting validators for: {html.file}")
+    await asyncio.to_thread(delete)
@@ -0,0 +1,284 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from dunia.error import DeadlineExceeded
+from dunia.extraction import load_content, parse_document_from_url
+from dunia.log import debug, warning
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from types import TracebackType
+    from typing import Any, Literal, Self
+
+    from dunia.document import Document
+
+
+ResultType = TypeVar("ResultType")
+
+
+@dataclass(slots=True, kw_only=True)
+class SchedulerStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    met: int = field(default=0, metadata={"help": "Jobs finished before the deadline"})
+    missed: int = field(
+        default=0, metadata={"help": "Jobs finished after the deadline"}
+    )
+    dropped: int = field(
+        default=0,
+        metadata={"help": "Jobs that were not started because the deadline had passed"},
+    )
+    deprioritized: int = field(
+        default=0,
+        metadata={
+            "help": "Jobs moved behind all the other jobs as the deadline had passed"
+        },
+    )
+    max_lateness: float = field(
+        default=0.0, metadata={"help": "Maximum lateness in seconds of a missed job"}
+    )
+    missed_by_priority: Counter[int] = field(default_factory=Counter)
+
+    @property
+    def miss_rate(self) -> float:
+        late = self.missed + self.dropped + self.deprioritized
+        return late / (self.met + late) if self.met + late else 0.0
+
+
+@dataclass(slots=True, kw_only=True)
+class Job(Generic[ResultType]):
+    url: str
+    priority: int
+    deadline: float | None
+    run: Callable[[], Awaitable[ResultType]]
+    future: asyncio.Future[ResultType]
+    expired: bool = False
+
+
+@dataclass(slots=True, kw_only=True)
+class Scheduler:
+    """
+    Priority and deadline-aware scheduler in front of load_content() / parse_document_from_url()
+
+    Jobs with higher priority run first, and within the same priority the job with the earliest deadline (absolute time.time()) runs first (EDF). Jobs whose deadline has passed before they are started are dropped (DeadlineExceeded exception) or deprioritized behind all the other jobs
+
+    Usage:
+        async with Scheduler(concurrency=8) as scheduler:
+            content = await scheduler.load_content(priority=10, deadline=time.time() + 900, browser=browser, url=url, html=html)
+    """
+
+    concurrency: int = 8
+    on_expired: Literal["drop", "deprioritize"] = field(
+        default="drop",
+        metadata={
+            "help": 'What to do with the job whose deadline has passed before it is started: "drop" or "deprioritize"'
+        },
+    )
+    stats: SchedulerStats = field(default_factory=SchedulerStats, init=False)
+
+    __heap: list[tuple[tuple[Any, ...], Job[Any]]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    __counter: itertools.count[int] = field(
+        default_factory=itertools.count, init=False, repr=False
+    )
+    __available: asyncio.Semaphore | None = field(default=None, init=False, repr=False)
+    __workers: list[asyncio.Task[None]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    async def start(self) -> None:
+        self.__available = asyncio.Semaphore(0)
+        self.__workers = [
+            asyncio.create_task(self.__work()) for _ in range(self.concurrency)
+        ]
+
+    async def close(self) -> None:
+        """
+        Cancel the workers and the jobs that are not finished
+        """
+        for worker in self.__workers:
+            worker.cancel()
+        await asyncio.gather(*self.__workers, return_exceptions=True)
+        self.__workers = []
+
+        while self.__heap:
+            _, job = heapq.heappop(self.__heap)
+            job.future.cancel()
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def submit(
+        self,
+        url: str,
+        run: Callable[[], Awaitable[ResultType]],
+        *,
+        priority: int = 0,
+        deadline: float | None = None,
+    ) -> asyncio.Future[ResultType]:
+        """
+        Schedule the job and return the future of its result
+        """
+        if not self.__available:
+            raise RuntimeError("Please call start() first")
+
+        job = Job(
+            url=url,
+            priority=priority,
+            deadline=deadline,
+            run=run,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self.__push(job)
+        self.stats.submitted += 1
+
+        return job.future
+
+    async def load_content(
+        self,
+        *,
+        priority: int = 0,
+        deadline: float | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Schedule load_content() with the keyword arguments
+        """
+        return await self.submit(
+            kwargs["url"],
+            lambda: load_content(**kwargs),
+            priority=priority,
+            deadline=deadline,
+        )
+
+    async def parse_document_from_url(
+        self,
+        browser: Any,
+        url: str,
+        *,
+        priority: int = 0,
+        deadline: float | None = None,
+        **kwargs: Any,
+    ) -> Document:
+        """
+        Schedule parse_document_from_url() with the keyword arguments
+        """
+        return await self.submit(
+            url,
+            lambda: parse_document_from_url(browser, url, **kwargs),
+            priority=priority,
+            deadline=deadline,
+        )
+
+    def pending(self) -> int:
+        return len(self.__heap)
+
+    def __push(self, job: Job[Any]) -> None:
+        assert self.__available
+
+        # ? Deprioritized jobs go behind all the other jobs (in the order of their deadlines)
+        key = (
+            job.expired,
+            -job.priority,
+            job.deadline if job.deadline is not None else math.inf,
+            next(self.__counter),
+        )
+        heapq.heappush(self.__heap, (key, job))
+        self.__available.release()
+
+    async def __work(self) -> None:
+        assert self.__available
+
+        while True:
+            await self.__available.acquire()
+            _, job = heapq.heappop(self.__heap)
+
+            if job.future.done():
+                continue
+
+            if (
+                not job.expired
+                and job.deadline is not None
+                and time.time() > job.deadline
+            ):
+                self.stats.missed_by_priority[job.priority] += 1
+
+                if self.on_expired == "drop":
+                    self.stats.dropped += 1
+                    warning(f"Dropped the job as its deadline has passed: {job.url}")
+                    job.future.set_exception(
+                        DeadlineExceeded("Deadline has passed before starting", job.url)
+                    )
+                    continue
+
+                self.stats.deprioritized += 1
+                debug(f"Deprioritized the job as its deadline has passed: {job.url}")
+                job.expired = True
+                self.__push(job)
+                continue
+
+            await self.__run(job)
+
+    async def __run(self, job: Job[Any]) -> None:
+        try:
+            result = await job.run()
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as err:
+            self.stats.failed += 1
+            if not job.future.done():
+                job.future.set_exception(err)
+            return
+
+        self.stats.completed += 1
+        if job.deadline is not None and not job.expired:
+            if (lateness := time.time() - job.deadline) > 0:
+                self.stats.missed += 1
+                self.stats.missed_by_priority[job.priority] += 1
+                self.stats.max_lateness = max(self.stats.max_lateness, lateness)
+            else:
+                self.stats.met += 1
+
+        if not job.future.done():
+            job.future.set_result(result)
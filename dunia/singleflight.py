@@ -0,0 +1,117 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import TYPE_CHECKING
+
+from dunia.log import debug
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Coroutine, Hashable
+    from typing import Any, ParamSpec, TypeVar
+
+    ParamsType = ParamSpec("ParamsType")
+    ReturnType = TypeVar("ReturnType")
+
+
+@dataclass(slots=True)
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one in-flight operation, so that all of the callers share its result or error
+    """
+
+    coalesced: int = field(
+        default=0,
+        metadata={"help": "Number of calls that awaited an in-flight operation"},
+    )
+
+    __calls: dict[Hashable, asyncio.Future[Any]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    __waiters: dict[Hashable, int] = field(default_factory=dict, init=False, repr=False)
+
+    async def do(
+        self, key: Hashable, factory: Callable[[], Awaitable[ReturnType]]
+    ) -> ReturnType:
+        if future := self.__calls.get(key):
+            self.coalesced += 1
+            debug(f"Waiting for the in-flight operation: {key}")
+        else:
+            future = asyncio.ensure_future(factory())
+            self.__calls[key] = future
+            future.add_done_callback(lambda done: self.__forget(key, done))
+
+        self.__waiters[key] = self.__waiters.get(key, 0) + 1
+        try:
+            # ? Cancellation of one caller shouldn't cancel the operation that other callers are waiting for
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # ? ... but the operation is cancelled together with its last caller
+            if self.__waiters.get(key) == 1 and not future.done():
+                debug(f"Cancelling the in-flight operation without callers: {key}")
+                future.cancel()
+            raise
+        finally:
+            if (waiters := self.__waiters.get(key, 0) - 1) > 0:
+                self.__waiters[key] = waiters
+            else:
+                self.__waiters.pop(key, None)
+
+    def in_flight(self) -> int:
+        return len(self.__calls)
+
+    def __forget(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+        if self.__calls.get(key) is future:
+            del self.__calls[key]
+
+        # ? Mark the exception as retrieved in case all of the callers have been cancelled
+        if not future.cancelled():
+            future.exception()
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    return _single_flight
+
+
+def single_flight(key: Callable[..., Hashable]):
+    """
+    Decorator that coalesces concurrent calls of the coroutine function with the same key (computed from the arguments)
+    """
+
+    def decorator(
+        fn: Callable[ParamsType, Coroutine[Any, Any, ReturnType]],
+    ) -> Callable[ParamsType, Coroutine[Any, Any, ReturnType]]:
+        @wraps(fn)
+        async def wrapper(*args: ParamsType.args, **kwargs: ParamsType.kwargs):
+            return await get_single_flight().do(
+                (fn.__name__, key(*args, **kwargs)), lambda: fn(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,248 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.error import ResultStoreError
+from dunia.helpers import compile_regex
+from dunia.log import debug
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, Mapping, Sequence
+    from pathlib import Path
+    from types import TracebackType
+    from typing import IO, Any, Literal, Self
+
+
+@dataclass(slots=True, kw_only=True)
+class StreamingSink:
+    """
+    Async sink that streams the records to rotating JSONL or CSV files (optionally gzip-compressed), so the memory stays flat regardless of the crawl size
+
+    Records are buffered and written in batches by a background task. put() waits when the buffer is full, so the producers are slowed down to the speed of the disk (backpressure)
+
+    Usage:
+        async with StreamingSink(directory="output", format="jsonl") as sink:
+            await sink.consume(records)  # ? or "await sink.put(record)" for every record
+    """
+
+    directory: Path | str = field(
+        metadata={"help": "Directory where the output files are created"}
+    )
+    prefix: str = field(default="results", metadata={"help": "Prefix of the files"})
+    format: Literal["jsonl", "csv"] = field(
+        default="jsonl", metadata={"help": "Output file format"}
+    )
+    fieldnames: Sequence[str] | None = field(
+        default=None,
+        metadata={
+            "help": "Columns of the CSV files. If no value is provided, the keys of the first record are used"
+        },
+    )
+    compress: bool = field(
+        default=False, metadata={"help": "Whether to gzip-compress the output files"}
+    )
+    max_records_per_file: int = field(
+        default=100000,
+        metadata={"help": "Number of records after which a new file is started"},
+    )
+    batch_size: int = field(
+        default=1000, metadata={"help": "Maximum number of records written at once"}
+    )
+    buffer_size: int = field(
+        default=10000,
+        metadata={
+            "help": "Maximum number of records buffered in memory before put() starts blocking"
+        },
+    )
+    written: int = field(default=0, init=False)
+    files: list[str] = field(default_factory=list[str], init=False)
+
+    __buffer: asyncio.Queue[Mapping[str, Any] | None] | None = field(
+        default=None, init=False, repr=False
+    )
+    __writer: asyncio.Task[None] | None = field(default=None, init=False, repr=False)
+    __file: IO[str] | None = field(default=None, init=False, repr=False)
+    __csv_writer: csv.DictWriter[str] | None = field(
+        default=None, init=False, repr=False
+    )
+    __file_records: int = field(default=0, init=False, repr=False)
+    __file_index: int = field(default=0, init=False, repr=False)
+    __error: BaseException | None = field(default=None, init=False, repr=False)
+
+    async def open(self) -> None:
+        """
+        Start the writer. File numbering continues after the existing files of the directory, so a resumed crawl doesn't overwrite the output of the previous run
+        """
+        await asyncio.to_thread(os.makedirs, self.directory, exist_ok=True)
+        self.__file_index = await asyncio.to_thread(self.__next_file_index)
+        self.__buffer = asyncio.Queue(maxsize=self.buffer_size)
+        self.__writer = asyncio.create_task(self.__write_forever(self.__buffer))
+
+    async def put(self, record: Mapping[str, Any]) -> None:
+        if not self.__buffer:
+            raise ResultStoreError("Please call open() first")
+
+        if self.__error:
+            raise ResultStoreError(
+                f"Writer has failed due to an error -> {self.__error}"
+            ) from self.__error
+
+        await self.__buffer.put(record)
+
+    async def consume(self, records: AsyncIterable[Mapping[str, Any]]) -> None:
+        """
+        Stream all the records of the async generator/iterable to the files
+        """
+        async for record in records:
+            await self.put(record)
+
+    async def close(self) -> None:
+        """
+        Write all the buffered records and close the current file
+        """
+        if self.__buffer and self.__writer:
+            if not self.__writer.done():
+                await self.__buffer.put(None)
+            await asyncio.gather(self.__writer, return_exceptions=True)
+            self.__writer = None
+
+        await asyncio.to_thread(self.__close_file)
+
+        if self.__error:
+            raise ResultStoreError(
+                f"Writer has failed due to an error -> {self.__error}"
+            ) from self.__error
+
+    async def __aenter__(self) -> Self:
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def __write_forever(
+        self, buffer: asyncio.Queue[Mapping[str, Any] | None]
+    ) -> None:
+        closed = False
+
+        while not closed:
+            batch: list[Mapping[str, Any]] = []
+
+            record = await buffer.get()
+            while record is not None:
+                batch.append(record)
+                if len(batch) >= self.batch_size or buffer.empty():
+                    break
+
+                record = buffer.get_nowait()
+            else:
+                closed = True
+
+            if batch and not self.__error:
+                try:
+                    await asyncio.to_thread(self.__write, batch)
+                except (OSError, TypeError, ValueError) as err:
+                    self.__error = err
+
+    def __next_file_index(self) -> int:
+        pattern = compile_regex(
+            rf"^{re.escape(self.prefix)}-(\d+)\.(?:jsonl|csv)(?:\.gz)?$"
+        )
+        indexes = [
+            int(match.group(1))
+            for name in os.listdir(self.directory)
+            if (match := pattern.match(name))
+        ]
+
+        return max(indexes, default=-1) + 1
+
+    def __open_file(self, record: Mapping[str, Any]) -> None:
+        extension = f".{self.format}.gz" if self.compress else f".{self.format}"
+        path = os.path.join(
+            self.directory, f"{self.prefix}-{self.__file_index:05d}{extension}"
+        )
+        self.__file_index += 1
+
+        self.__file = (
+            gzip.open(path, "wt", encoding="utf-8", newline="")
+            if self.compress
+            else open(path, "w", encoding="utf-8", newline="")
+        )
+        self.__file_records = 0
+        self.files.append(path)
+        debug(f"Streaming records to: {path}")
+
+        if self.format == "csv":
+            self.__csv_writer = csv.DictWriter(
+                self.__file,
+                fieldnames=list(self.fieldnames or record.keys()),
+                extrasaction="ignore",
+            )
+            self.__csv_writer.writeheader()
+
+    def __close_file(self) -> None:
+        if self.__file:
+            self.__file.close()
+            self.__file = None
+            self.__csv_writer = None
+
+    def __write(self, batch: list[Mapping[str, Any]]) -> None:
+        start = 0
+
+        while start < len(batch):
+            if not self.__file:
+                self.__open_file(batch[start])
+
+            assert self.__file
+            end = start + self.max_records_per_file - self.__file_records
+            chunk = batch[start:end]
+
+            if self.__csv_writer:
+                self.__csv_writer.writerows(chunk)
+            else:
+                self.__file.write(
+                    "".join(
+                        json.dumps(record, ensure_ascii=False, default=str) + "\n"
+                        for record in chunk
+                    )
+                )
+
+            self.__file_records += len(chunk)
+            self.written += len(chunk)
+            start += len(chunk)
+
+            if self.__file_records >= self.max_records_per_file:
+                self.__close_file()
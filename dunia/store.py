@@ -0,0 +1,224 @@
+# MIT License
+
+# Copyright (c) 2022-2025 Danyal Zia Khan
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from dunia.error import ResultStoreError
+from dunia.helpers import compile_regex
+from dunia.log import debug, error
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+    from typing import Any, Final, Self
+
+
+IDENTIFIER_REGEX: Final[str] = r"^[A-Za-z_][A-Za-z0-9_]*$"
+
+
+@dataclass(slots=True, kw_only=True)
+class SQLiteResultStore:
+    """
+    Async sink for the extracted records backed by a local SQLite file in WAL mode
+
+    Records are upserted (keyed by URL) in batches with executemany() by a dedicated writer thread, so the event loop is never blocked by disk I/O. put() waits when max_pending records are not written yet (backpressure)
+
+    Usage:
+        async with SQLiteResultStore(path="results.db") as store:
+            await store.put(url, record)
+    """
+
+    path: Path | str = field(metadata={"help": "SQLite database file"})
+    table: str = field(
+        default="results", metadata={"help": "Table where the records are stored"}
+    )
+    batch_size: int = field(
+        default=1000,
+        metadata={"help": "Maximum number of records written in one transaction"},
+    )
+    flush_interval: float = field(
+        default=1.0,
+        metadata={
+            "help": "Maximum time in seconds a record waits in the queue before the batch is written"
+        },
+    )
+    max_pending: int = field(
+        default=10000,
+        metadata={
+            "help": "Maximum number of records waiting to be written before put() starts blocking"
+        },
+    )
+    written: int = field(default=0, init=False)
+
+    __queue: queue.SimpleQueue[tuple[str, Any] | None] = field(
+        default_factory=queue.SimpleQueue,
+        init=False,
+        repr=False,
+    )
+    __pending: asyncio.Semaphore | None = field(default=None, init=False, repr=False)
+    __connection: sqlite3.Connection | None = field(
+        default=None, init=False, repr=False
+    )
+    __thread: threading.Thread | None = field(default=None, init=False, repr=False)
+    __error: BaseException | None = field(default=None, init=False, repr=False)
+
+    async def open(self) -> None:
+        if not compile_regex(IDENTIFIER_REGEX).match(self.table):
+            raise ValueError(f"Invalid table name: {self.table}")
+
+        self.__pending = asyncio.Semaphore(self.max_pending)
+        self.__connection = await asyncio.to_thread(self.__connect)
+        self.__thread = threading.Thread(
+            target=self.__write_forever,
+            args=(asyncio.get_running_loop(), self.__pending),
+            name=f"SQLiteResultStore({self.path})",
+            daemon=True,
+        )
+        self.__thread.start()
+
+    async def put(self, url: str, record: Any) -> None:
+        """
+        Queue the JSON serializable record to be upserted for the URL
+        """
+        if not self.__pending or not self.__thread:
+            raise ResultStoreError("Please call open() first")
+
+        await self.__pending.acquire()
+
+        if self.__error:
+            self.__pending.release()
+            raise ResultStoreError(
+                f"Writer thread has failed due to an error -> {self.__error}"
+            ) from self.__error
+
+        self.__queue.put((url, record))
+
+    async def close(self) -> None:
+        """
+        Write all the queued records and close the database
+        """
+        if self.__thread:
+            self.__queue.put(None)
+            await asyncio.to_thread(self.__thread.join)
+            self.__thread = None
+
+        if self.__connection:
+            await asyncio.to_thread(self.__connection.close)
+            self.__connection = None
+
+        if self.__error:
+            raise ResultStoreError(
+                f"Writer thread has failed due to an error -> {self.__error}"
+            ) from self.__error
+
+    async def __aenter__(self) -> Self:
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def __connect(self) -> sqlite3.Connection:
+        # ? Connection is created here but only used by the writer thread after that
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} (url TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        connection.commit()
+
+        return connection
+
+    def __next_batch(self) -> tuple[list[tuple[str, Any]], bool]:
+        batch: list[tuple[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            try:
+                item = (
+                    self.__queue.get(timeout=remaining)
+                    if (remaining := deadline - time.monotonic()) > 0
+                    else self.__queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+
+            if item is None:
+                return batch, True
+
+            batch.append(item)
+
+        return batch, False
+
+    def __write_forever(
+        self, loop: asyncio.AbstractEventLoop, pending: asyncio.Semaphore
+    ) -> None:
+        assert self.__connection
+
+        statement = (
+            f"INSERT INTO {self.table} (url, data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at"
+        )
+
+        closed = False
+        while not closed:
+            batch, closed = self.__next_batch()
+            if not batch:
+                continue
+
+            try:
+                if not self.__error:
+                    now = time.time()
+                    rows = [
+                        (url, json.dumps(record, ensure_ascii=False, default=str), now)
+                        for url, record in batch
+                    ]
+                    with self.__connection:
+                        self.__connection.executemany(statement, rows)
+
+                    self.written += len(rows)
+                    debug(f"Upserted {len(rows)} records ({self.written} total)")
+            except (sqlite3.Error, TypeError, ValueError) as err:
+                error(f"Could not write the records to {self.path} -> {err}")
+                self.__error = err
+            finally:
+                # ? Release the slots in the event loop thread as asyncio.Semaphore is not thread-safe
+                loop.call_soon_threadsafe(release, pending, len(batch))
+
+
+def release(semaphore: asyncio.Semaphore, count: int) -> None:
+    for _ in range(count):
+        semaphore.release()